@@ -1,15 +1,35 @@
-import asynchronet.vendors
-from asynchronet.dispatcher import create, platforms
-from asynchronet.exceptions import DisconnectError, TimeoutError, CommitError
-from asynchronet.logger import logger
-from asynchronet.version import __author__, __author_email__, __url__, __version__
-
-__all__ = (
-    "create",
-    "platforms",
-    "logger",
-    "DisconnectError",
-    "TimeoutError",
-    "CommitError",
-    "vendors",
-)
+from asynchronet.dispatcher import create, platforms
+from asynchronet.exceptions import (
+    DisconnectError,
+    TimeoutError,
+    CommitError,
+    UnsupportedDeviceType,
+)
+from asynchronet.logger import logger
+from asynchronet.pool import ConnectionPool, create_pooled
+from asynchronet.version import __author__, __author_email__, __url__, __version__
+
+__all__ = (
+    "create",
+    "create_pooled",
+    "ConnectionPool",
+    "platforms",
+    "logger",
+    "DisconnectError",
+    "TimeoutError",
+    "CommitError",
+    "UnsupportedDeviceType",
+    "vendors",
+)
+
+
+def __getattr__(name):
+    # The vendors package eagerly imports every device class, so it is
+    # loaded on first attribute access instead of at import time -
+    # `import asynchronet` plus create() only pays for the vendor module
+    # the device_type actually needs
+    if name == "vendors":
+        import asynchronet.vendors
+
+        return asynchronet.vendors
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,53 @@
+"""Disk-backed response cache for autodetect probing.
+
+Repeated autodetect runs against the same host (retries, process
+restarts, fleet-wide inventory sweeps) resend identical probe commands
+whose answers almost never change. Caching them under the user's home
+directory turns a network round trip into a local file read.
+"""
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from asynchronet.logger import logger
+
+# Cache entries live under ~/.asynchronet/cache/<sha256(host|cmd)>.json
+CACHE_DIR = Path.home() / ".asynchronet" / "cache"
+
+
+def _cache_path(host: str, cmd: str) -> Path:
+    """Returns the cache file path for a (host, cmd) pair"""
+    digest = hashlib.sha256(f"{host}|{cmd}".encode()).hexdigest()
+    return CACHE_DIR / f"{digest}.json"
+
+
+async def cached_send(host: str, cmd: str, ttl: int, fetch):
+    """Returns the cached response for (host, cmd) or fetches and stores it
+
+    :param str host: device hostname or ip address the command targets
+    :param str cmd: command whose output is cached
+    :param int ttl: seconds a stored response stays valid
+    :param fetch: coroutine function called with cmd on a cache miss
+    :return: The (possibly cached) output of the command
+    """
+    path = _cache_path(host, cmd)
+    try:
+        entry = json.loads(path.read_text())
+        if entry["expires_at"] > time.time():
+            logger.debug("Host %s: Cache hit for command %r", host, cmd)
+            return entry["response"]
+    except (OSError, ValueError, KeyError):
+        # Missing, expired or corrupt entries all mean a normal fetch
+        pass
+
+    response = await fetch(cmd)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps({"response": response, "expires_at": time.time() + ttl})
+        )
+    except OSError:
+        # A read-only home directory must not break probing
+        logger.debug("Host %s: Unable to write cache entry for %r", host, cmd)
+    return response
@@ -1,117 +1,172 @@
-"""Contains the factory function which generates asynhcronet device objects.
-
-"""
-from asynchronet.vendors import AlcatelAOS
-from asynchronet.vendors import AristaEOS
-from asynchronet.vendors import ArubaAOS6, ArubaAOS8
-from asynchronet.vendors import CiscoASA, CiscoIOS, CiscoIOSXR, CiscoNXOS, CiscoSG3XX
-from asynchronet.vendors import FujitsuSwitch
-from asynchronet.vendors import HPComware, HPComwareLimited
-from asynchronet.vendors import JuniperJunOS
-from asynchronet.vendors import MikrotikRouterOS
-from asynchronet.vendors import Terminal
-from asynchronet.vendors import UbiquityEdgeSwitch
-from asynchronet.vendors import HW1000
-from asynchronet.vendors import Huawei
-
-# @formatter:off
-# The keys of this dictionary are the supported device_types
-CLASS_MAPPER = {
-    "alcatel_aos": AlcatelAOS,
-    "arista_eos": AristaEOS,
-    "aruba_aos_6": ArubaAOS6,
-    "aruba_aos_8": ArubaAOS8,
-    "cisco_asa": CiscoASA,
-    "cisco_ios": CiscoIOS,
-    "cisco_ios_xe": CiscoIOS,
-    "cisco_ios_xr": CiscoIOSXR,
-    "cisco_nxos": CiscoNXOS,
-    "cisco_sg3xx": CiscoSG3XX,
-    "fujitsu_switch": FujitsuSwitch,
-    "hp_comware": HPComware,
-    "hp_comware_limited": HPComwareLimited,
-    "juniper_junos": JuniperJunOS,
-    "mikrotik_routeros": MikrotikRouterOS,
-    "ubiquity_edge": UbiquityEdgeSwitch,
-    "terminal": Terminal,
-    "hw1000": HW1000,
-    "huawei": Huawei,
-}
-
-# @formatter:on
-
-platforms = list(CLASS_MAPPER.keys())
-platforms.sort()
-platforms_str = "\n".join(platforms)
-
-
-def create(*args, **kwargs):
-    """Selects the proper vendor and creates an object based on device_type
-
-    Selects the proper class and creates a device object based on
-    the device_type argument.
-
-    Other parameters:
-        **host: device hostname or ip address for connection
-        **username: username for logging to device
-        **password: user password for logging to device
-        **port: ssh port for connection. Default is 22
-        **device_type: network device type
-        **timeout: timeout in second for getting information from channel
-        **loop: asyncio loop object
-        **known_hosts: file with known hosts. Default is None (no policy).
-            With () it will use default file
-        **local_addr: local address for binding source of tcp connection
-        **client_keys: path for client keys. Default in None.
-            With () it will use default file in OS
-        **passphrase: password for encrypted client keys
-        **tunnel: An existing SSH connection that this new connection
-            should be tunneled over
-        **pattern: pattern for searching the end of device prompt.
-                Example: r"{hostname}.*?(\(.*?\))?[{delimeters}]"
-        **agent_forwarding: Allow or not allow agent forward for server
-        **agent_path:
-            The path of a UNIX domain socket to use to contact an ssh-agent
-            process which will perform the operations needed for client
-            public key authentication. If this is not specified and the environment
-            variable `SSH_AUTH_SOCK` is set, its value will be used as the path.
-            If `client_keys` is specified or this argument is explicitly set to `None`,
-            an ssh-agent will not be used.
-        **client_version: version which advertised to ssh server
-        **family:
-           The address family to use when creating the socket. By default,
-           the address family is automatically selected based on the host.
-        **kex_algs:
-            A list of allowed key exchange algorithms in the SSH handshake,
-            taken from `key exchange algorithms
-            <https://asyncssh.readthedocs.io/en/latest/api.html#kexalgs>`_
-        **encryption_algs:
-            A list of encryption algorithms to use during the SSH handshake,
-            taken from `encryption algorithms
-            <https://asyncssh.readthedocs.io/en/latest/api.html#encryptionalgs>`_
-        **mac_algs:
-            A list of MAC algorithms to use during the SSH handshake, taken
-            from `MAC algorithms
-            <https://asyncssh.readthedocs.io/en/latest/api.html#macalgs>`_
-        **compression_algs:
-            A list of compression algorithms to use during the SSH handshake,
-            taken from `compression algorithms
-            <https://asyncssh.readthedocs.io/en/latest/api.html#compressionalgs>`_, or
-            `None` to disable compression
-        **signature_algs:
-            A list of public key signature algorithms to use during the SSH
-            handshake, taken from `signature algorithms
-            <https://asyncssh.readthedocs.io/en/latest/api.html#signaturealgs>`_
-        **server_host_key_algs:
-            A list of server host key algorithms to allow during the SSH handshake,
-            taken from server host key algorithms.
-            https://asyncssh.readthedocs.io/en/latest/api.html#publickeyalgs
-
-    """
-    if kwargs["device_type"] not in platforms:
-        raise ValueError(
-            f"Unsupported device_type: "
-            f"currently supported platforms are: {platforms_str}"
-        )
-    connection_class = CLASS_MAPPER[kwargs["device_type"]]
-    return connection_class(*args, **kwargs)
+"""Contains the factory function which generates asynhcronet device objects.
+
+"""
+import importlib
+
+from asynchronet.exceptions import UnsupportedDeviceType
+
+try:
+    from asyncssh.encryption import get_default_encryption_algs
+    from asyncssh.mac import get_default_mac_algs
+except ImportError:  # pragma: no cover - asyncssh internal layout changed
+    get_default_encryption_algs = get_default_mac_algs = None
+
+# @formatter:off
+# The keys of this dictionary are the supported device_types. Values are
+# (module, class name) pairs that are imported lazily on first use, so
+# creating one device does not pull in every vendor module
+CLASS_MAPPER = {
+    "alcatel_aos": ("asynchronet.vendors.alcatel", "AlcatelAOS"),
+    "arista_eos": ("asynchronet.vendors.arista", "AristaEOS"),
+    "aruba_aos_6": ("asynchronet.vendors.aruba", "ArubaAOS6"),
+    "aruba_aos_8": ("asynchronet.vendors.aruba", "ArubaAOS8"),
+    "cisco_asa": ("asynchronet.vendors.cisco", "CiscoASA"),
+    "cisco_ios": ("asynchronet.vendors.cisco", "CiscoIOS"),
+    "cisco_ios_xe": ("asynchronet.vendors.cisco", "CiscoIOS"),
+    "cisco_ios_xr": ("asynchronet.vendors.cisco", "CiscoIOSXR"),
+    "cisco_nxos": ("asynchronet.vendors.cisco", "CiscoNXOS"),
+    "cisco_sg3xx": ("asynchronet.vendors.cisco", "CiscoSG3XX"),
+    "fujitsu_switch": ("asynchronet.vendors.fujitsu", "FujitsuSwitch"),
+    "hp_comware": ("asynchronet.vendors.hp", "HPComware"),
+    "hp_comware_limited": ("asynchronet.vendors.hp", "HPComwareLimited"),
+    "juniper_junos": ("asynchronet.vendors.juniper", "JuniperJunOS"),
+    "mikrotik_routeros": ("asynchronet.vendors.mikrotik", "MikrotikRouterOS"),
+    "ubiquity_edge": ("asynchronet.vendors.ubiquiti", "UbiquityEdgeSwitch"),
+    "terminal": ("asynchronet.vendors.terminal", "Terminal"),
+    "hw1000": ("asynchronet.vendors.infotecs", "HW1000"),
+    "huawei": ("asynchronet.vendors.huawei", "Huawei"),
+}
+
+# @formatter:on
+
+platforms = tuple(sorted(CLASS_MAPPER))
+platforms_str = "\n".join(platforms)
+
+# Built once; batch probing with typo-ridden device lists should not pay
+# a fresh f-string interpolation per rejected entry
+_UNSUPPORTED_MSG = (
+    f"Unsupported device_type: currently supported platforms are: {platforms_str}"
+)
+
+# Frozen copy of the supported device_types for O(1) membership checks
+_PLATFORM_SET = frozenset(CLASS_MAPPER)
+
+# device_type -> loaded vendor class, filled on first use so the hot
+# path of create() is a single dict lookup
+_FACTORIES: dict = {}
+
+
+def _prefer_algs(fast, default_algs):
+    """Moves the fast algorithms to the front of asyncssh's default list
+
+    Every algorithm asyncssh offers by default stays in the list, so
+    this orders the negotiation without restricting it - devices whose
+    SSH stack lacks the fast ciphers still handshake on their usual
+    algorithms.
+    """
+    defaults = [alg.decode() for alg in default_algs()]
+    return fast + [alg for alg in defaults if alg not in fast]
+
+
+if get_default_encryption_algs is not None:
+    # Performance-oriented transport preferences: AES-GCM/ChaCha20
+    # ciphers and ETM MACs are cheapest on CPUs with AES-NI
+    _PREFERRED_ENCRYPTION_ALGS = _prefer_algs(
+        [
+            "aes128-gcm@openssh.com",
+            "aes256-gcm@openssh.com",
+            "chacha20-poly1305@openssh.com",
+        ],
+        get_default_encryption_algs,
+    )
+    _PREFERRED_MAC_ALGS = _prefer_algs(
+        ["hmac-sha2-256-etm@openssh.com", "umac-128-etm@openssh.com"],
+        get_default_mac_algs,
+    )
+else:  # pragma: no cover - fall back to asyncssh's own ordering
+    _PREFERRED_ENCRYPTION_ALGS = _PREFERRED_MAC_ALGS = None
+
+
+def _load_class(device_type):
+    """Imports and returns the vendor class registered for device_type"""
+    module_name, class_name = CLASS_MAPPER[device_type]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def create(*args, **kwargs):
+    """Selects the proper vendor and creates an object based on device_type
+
+    Selects the proper class and creates a device object based on
+    the device_type argument.
+
+    Other parameters:
+        **host: device hostname or ip address for connection
+        **username: username for logging to device
+        **password: user password for logging to device
+        **port: ssh port for connection. Default is 22
+        **device_type: network device type
+        **timeout: timeout in second for getting information from channel
+        **loop: asyncio loop object
+        **known_hosts: file with known hosts. Default is None (no policy).
+            With () it will use default file
+        **local_addr: local address for binding source of tcp connection
+        **client_keys: path for client keys. Default in None.
+            With () it will use default file in OS
+        **passphrase: password for encrypted client keys
+        **tunnel: An existing SSH connection that this new connection
+            should be tunneled over
+        **pattern: pattern for searching the end of device prompt.
+                Example: r"{hostname}.*?(\(.*?\))?[{delimeters}]"
+        **agent_forwarding: Allow or not allow agent forward for server
+        **agent_path:
+            The path of a UNIX domain socket to use to contact an ssh-agent
+            process which will perform the operations needed for client
+            public key authentication. If this is not specified and the environment
+            variable `SSH_AUTH_SOCK` is set, its value will be used as the path.
+            If `client_keys` is specified or this argument is explicitly set to `None`,
+            an ssh-agent will not be used.
+        **client_version: version which advertised to ssh server
+        **family:
+           The address family to use when creating the socket. By default,
+           the address family is automatically selected based on the host.
+        **kex_algs:
+            A list of allowed key exchange algorithms in the SSH handshake,
+            taken from `key exchange algorithms
+            <https://asyncssh.readthedocs.io/en/latest/api.html#kexalgs>`_
+        **encryption_algs:
+            A list of encryption algorithms to use during the SSH handshake,
+            taken from `encryption algorithms
+            <https://asyncssh.readthedocs.io/en/latest/api.html#encryptionalgs>`_
+        **mac_algs:
+            A list of MAC algorithms to use during the SSH handshake, taken
+            from `MAC algorithms
+            <https://asyncssh.readthedocs.io/en/latest/api.html#macalgs>`_
+        **compression_algs:
+            A list of compression algorithms to use during the SSH handshake,
+            taken from `compression algorithms
+            <https://asyncssh.readthedocs.io/en/latest/api.html#compressionalgs>`_, or
+            `None` to disable compression
+        **signature_algs:
+            A list of public key signature algorithms to use during the SSH
+            handshake, taken from `signature algorithms
+            <https://asyncssh.readthedocs.io/en/latest/api.html#signaturealgs>`_
+        **server_host_key_algs:
+            A list of server host key algorithms to allow during the SSH handshake,
+            taken from server host key algorithms.
+            https://asyncssh.readthedocs.io/en/latest/api.html#publickeyalgs
+
+    """
+    device_type = kwargs.get("device_type")
+    connection_class = _FACTORIES.get(device_type)
+    if connection_class is None:
+        if device_type not in _PLATFORM_SET:
+            raise UnsupportedDeviceType(_UNSUPPORTED_MSG)
+        connection_class = _FACTORIES[device_type] = _load_class(device_type)
+    # Performance-oriented transport defaults: prefer (not require) the
+    # fast ciphers and MACs, and disable SSH compression. Callers can
+    # override by passing the kwarg explicitly
+    if _PREFERRED_ENCRYPTION_ALGS is not None:
+        kwargs.setdefault("encryption_algs", _PREFERRED_ENCRYPTION_ALGS)
+        kwargs.setdefault("mac_algs", _PREFERRED_MAC_ALGS)
+    kwargs.setdefault("compression_algs", None)
+    return connection_class(*args, **kwargs)
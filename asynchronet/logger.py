@@ -1,7 +1,7 @@
-"""
-Logging configuration for netdev
-"""
-import logging
-
-logger = logging.getLogger(__package__)
-logger.setLevel(logging.WARNING)
+"""
+Logging configuration for netdev
+"""
+import logging
+
+logger = logging.getLogger(__package__)
+logger.setLevel(logging.WARNING)
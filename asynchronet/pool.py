@@ -0,0 +1,187 @@
+"""
+Connection pooling for asynchronet devices
+
+Amortizes the TCP + SSH key-exchange handshake across operations by
+reusing live device connections, in the spirit of OpenSSH ControlMaster.
+Connections are keyed by (host, port, username) and evicted after a
+configurable time-to-live.
+"""
+
+import asyncio
+import atexit
+import time
+
+from asynchronet.dispatcher import create
+from asynchronet.logger import logger
+
+
+class ConnectionPool:
+    """Pool of connected devices keyed by (host, port, username)
+
+    Usage::
+
+        pool = ConnectionPool(ttl=60)
+        async with pool.acquire(**device_params) as device:
+            await device.send_command("show version")
+        ...
+        await pool.close()
+
+    Released devices stay connected until their TTL expires or the pool
+    outgrows max_size, so subsequent operations against the same host
+    skip the SSH handshake entirely.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_size: int = 128):
+        """
+        Initialize the connection pool
+
+        :param float ttl: seconds a released connection stays reusable
+        :param int max_size: maximum number of idle connections retained
+        """
+        self._ttl = ttl
+        self._max_size = max_size
+        # key -> (connected device, expiry timestamp)
+        self._idle = {}
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _key(params):
+        """Builds the pool key from device connection parameters"""
+        return (
+            params.get("host"),
+            int(params.get("port", 22)),
+            params.get("username"),
+        )
+
+    def acquire(self, **kwargs):
+        """Returns an async context manager yielding a connected device
+
+        The device is taken from the pool when a live connection for the
+        same (host, port, username) exists, otherwise a new one is created
+        via dispatcher.create() and connected. On exit the device is
+        returned to the pool instead of being disconnected.
+        """
+        return _PooledDevice(self, kwargs)
+
+    async def _checkout(self, params):
+        """Takes a pooled device or connects a fresh one"""
+        key = self._key(params)
+        async with self._lock:
+            entry = self._idle.pop(key, None)
+        if entry is not None:
+            device, expiry = entry
+            conn = device._conn
+            if time.monotonic() < expiry and conn is not None:
+                if not conn.is_closed():
+                    logger.info("Host %s: Reusing pooled connection", key[0])
+                    return device
+            await self._close_device(device)
+        device = create(**params)
+        await device.connect()
+        return device
+
+    async def _checkin(self, device, key):
+        """Returns a device to the pool under its checkout key
+
+        The key is remembered at checkout time: some device classes
+        mutate their connection parameters (MikrotikRouterOS appends
+        login flags to the username), so rebuilding the key from the
+        device would file it where _checkout never looks.
+        """
+        expiry = time.monotonic() + self._ttl
+        evicted = []
+        async with self._lock:
+            if key in self._idle:
+                # Another connection to the same endpoint was released
+                # first; keep that one and drop this device
+                evicted.append(device)
+            else:
+                self._idle[key] = (device, expiry)
+                while len(self._idle) > self._max_size:
+                    # Evict the entry closest to expiry
+                    oldest = min(self._idle, key=lambda k: self._idle[k][1])
+                    evicted.append(self._idle.pop(oldest)[0])
+        for stale in evicted:
+            await self._close_device(stale)
+
+    @staticmethod
+    async def _close_device(device):
+        """Disconnects a device, ignoring errors on dead connections"""
+        try:
+            await device.disconnect()
+        except Exception:
+            logger.info("Host %s: Discarding dead pooled connection", device._host)
+
+    async def close(self):
+        """Disconnects and drops every idle connection in the pool"""
+        async with self._lock:
+            devices = [device for device, _ in self._idle.values()]
+            self._idle.clear()
+        for device in devices:
+            await self._close_device(device)
+
+
+class _PooledDevice:
+    """Async context manager handing out and returning pooled devices"""
+
+    def __init__(self, pool, params):
+        self._pool = pool
+        self._params = params
+        self._key = pool._key(params)
+        self._device = None
+
+    async def __aenter__(self):
+        self._device = await self._pool._checkout(self._params)
+        return self._device
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        device, self._device = self._device, None
+        if device is None:
+            return
+        if exc_type is not None:
+            # A failure mid-command can leave unread data on the
+            # channel; discard the session rather than handing a
+            # desynchronized device to the next caller
+            await self._pool._close_device(device)
+            return
+        await self._pool._checkin(device, self._key)
+
+
+# Default pool used by create_pooled() when none is supplied
+_default_pool = ConnectionPool()
+
+
+def _close_default_pool():
+    """Best-effort shutdown of the default pool at interpreter exit
+
+    The event loop that owned the pooled connections is usually already
+    closed by the time atexit handlers run, so the async disconnect path
+    is unavailable; each transport is aborted directly instead, and
+    connections whose loop is gone are simply dropped - their sockets
+    close with the process.
+    """
+    idle, _default_pool._idle = _default_pool._idle, {}
+    for device, _ in idle.values():
+        conn = device._conn
+        if conn is None:
+            continue
+        try:
+            conn.abort()
+        except Exception:
+            pass
+
+
+atexit.register(_close_default_pool)
+
+
+def create_pooled(*, pool: ConnectionPool | None = None, **kwargs):
+    """Like dispatcher.create(), but served from a connection pool
+
+    Returns an async context manager yielding a connected device; use in
+    place of ``async with asynchronet.create(**params)`` when the same
+    hosts are contacted repeatedly. Device parameters are keyword-only,
+    matching dispatcher.create().
+    """
+    if pool is None:
+        pool = _default_pool
+    return pool.acquire(**kwargs)
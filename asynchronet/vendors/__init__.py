@@ -1,54 +1,77 @@
-from asynchronet.vendors.alcatel import AlcatelAOS
-from asynchronet.vendors.arista import AristaEOS
-from asynchronet.vendors.aruba import ArubaAOS8, ArubaAOS6
-from asynchronet.vendors.base import BaseDevice
-from asynchronet.vendors.cisco import (
-    CiscoNXOS,
-    CiscoIOSXR,
-    CiscoASA,
-    CiscoIOS,
-    CiscoSG3XX,
-)
-from asynchronet.vendors.comware_like import ComwareLikeDevice
-from asynchronet.vendors.fujitsu import FujitsuSwitch
-from asynchronet.vendors.hp import HPComware, HPComwareLimited
-from asynchronet.vendors.ios_like import IOSLikeDevice
-from asynchronet.vendors.juniper import JuniperJunOS
-from asynchronet.vendors.junos_like import JunOSLikeDevice
-from asynchronet.vendors.mikrotik import MikrotikRouterOS
-from asynchronet.vendors.terminal import Terminal
-from asynchronet.vendors.ubiquiti import UbiquityEdgeSwitch
-from asynchronet.vendors.infotecs import HW1000
-from asynchronet.vendors.huawei import Huawei
-
-__all__ = (
-    "CiscoASA",
-    "CiscoIOS",
-    "CiscoIOSXR",
-    "CiscoNXOS",
-    "CiscoSG3XX",
-    "HPComware",
-    "HPComwareLimited",
-    "FujitsuSwitch",
-    "MikrotikRouterOS",
-    "JuniperJunOS",
-    "JunOSLikeDevice",
-    "AristaEOS",
-    "ArubaAOS6",
-    "ArubaAOS8",
-    "BaseDevice",
-    "IOSLikeDevice",
-    "ComwareLikeDevice",
-    "Terminal",
-    "arista",
-    "aruba",
-    "cisco",
-    "fujitsu",
-    "hp",
-    "juniper",
-    "mikrotik",
-    "UbiquityEdgeSwitch",
-    "HW1000",
-    "AlcatelAOS",
-    "Huawei",
-)
+import importlib
+
+# Exported name -> defining submodule, resolved on first attribute
+# access so importing one vendor family does not load the others
+_LAZY_IMPORTS = {
+    "AlcatelAOS": "asynchronet.vendors.alcatel",
+    "AristaEOS": "asynchronet.vendors.arista",
+    "ArubaAOS6": "asynchronet.vendors.aruba",
+    "ArubaAOS8": "asynchronet.vendors.aruba",
+    "BaseDevice": "asynchronet.vendors.base",
+    "CiscoASA": "asynchronet.vendors.cisco",
+    "CiscoIOS": "asynchronet.vendors.cisco",
+    "CiscoIOSXR": "asynchronet.vendors.cisco",
+    "CiscoNXOS": "asynchronet.vendors.cisco",
+    "CiscoSG3XX": "asynchronet.vendors.cisco",
+    "ComwareLikeDevice": "asynchronet.vendors.comware_like",
+    "FujitsuSwitch": "asynchronet.vendors.fujitsu",
+    "HPComware": "asynchronet.vendors.hp",
+    "HPComwareLimited": "asynchronet.vendors.hp",
+    "HW1000": "asynchronet.vendors.infotecs",
+    "Huawei": "asynchronet.vendors.huawei",
+    "IOSLikeDevice": "asynchronet.vendors.ios_like",
+    "JunOSLikeDevice": "asynchronet.vendors.junos_like",
+    "JuniperJunOS": "asynchronet.vendors.juniper",
+    "MikrotikRouterOS": "asynchronet.vendors.mikrotik",
+    "Terminal": "asynchronet.vendors.terminal",
+    "UbiquityEdgeSwitch": "asynchronet.vendors.ubiquiti",
+}
+
+# Vendor subpackages importable as attributes of this package
+_SUBPACKAGES = frozenset(
+    ("arista", "aruba", "cisco", "fujitsu", "hp", "juniper", "mikrotik")
+)
+
+__all__ = (
+    "CiscoASA",
+    "CiscoIOS",
+    "CiscoIOSXR",
+    "CiscoNXOS",
+    "CiscoSG3XX",
+    "HPComware",
+    "HPComwareLimited",
+    "FujitsuSwitch",
+    "MikrotikRouterOS",
+    "JuniperJunOS",
+    "JunOSLikeDevice",
+    "AristaEOS",
+    "ArubaAOS6",
+    "ArubaAOS8",
+    "BaseDevice",
+    "IOSLikeDevice",
+    "ComwareLikeDevice",
+    "Terminal",
+    "arista",
+    "aruba",
+    "cisco",
+    "fujitsu",
+    "hp",
+    "juniper",
+    "mikrotik",
+    "UbiquityEdgeSwitch",
+    "HW1000",
+    "AlcatelAOS",
+    "Huawei",
+)
+
+
+def __getattr__(name):
+    if name in _SUBPACKAGES:
+        return importlib.import_module(f"{__name__}.{name}")
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    # Cache on the package so subsequent lookups skip this hook
+    globals()[name] = value
+    return value
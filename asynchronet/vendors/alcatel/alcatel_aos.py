@@ -1,34 +1,107 @@
 from typing import Any
+from asynchronet.exceptions import TimeoutError
 from asynchronet.vendors.base import BaseDevice
 from asynchronet.logger import logger
 import asyncio
+import logging
 import re
 
+# Overlap (in characters) between consecutive prompt scans. Bounds the
+# length of a prompt that may straddle a read-chunk boundary
+_SCAN_OVERLAP = 64
+
+# Ceiling for the adaptively grown read buffer (1 MiB)
+_MAX_ADAPTIVE_BUFFER = 1 << 20
+
 
 class AlcatelAOS(BaseDevice):
     """Class for interacting with Alcatel AOS devices."""
 
+    __slots__ = ()
+
     async def _read_until_prompt_or_pattern(self, pattern="", re_flags=0) -> Any:
         """
         Read until either self.base_pattern or pattern is detected.
         Return all data available
         """
-        output = ""
-        logger.info(f"Host {self._host}: Reading until prompt or pattern")
-        if not pattern:
-            pattern = self._base_pattern
-        base_prompt_pattern = self._base_pattern
-        while True:
-            fut = self._stdout.read(self._MAX_BUFFER)
+        logger.info("Host %s: Reading until prompt or pattern", self._host)
+        base_pattern = self._base_pattern
+        # Compile once before the read loop instead of re-searching with
+        # freshly concatenated pattern strings on every buffered read
+        if not pattern or pattern == base_pattern:
+            combined_re = re.compile("\n" + base_pattern, re_flags)
+        else:
+            combined_re = re.compile(f"\n(?:{pattern}|{base_pattern})", re_flags)
+        # Collect chunks in a list and join once on return; repeated str
+        # concatenation would copy the whole buffer on every read. The
+        # prompt scan runs on a rolling window of the new chunk plus a
+        # small overlap, keeping total regex work linear in output size
+        chunks = []
+        window = ""
+        # Grow the read size while full reads keep coming (bulk output
+        # such as "show tech"), cutting loop iterations; reading more
+        # than is available is safe, asyncssh just returns less. The
+        # size resets to _MAX_BUFFER on the next call
+        max_buffer = self._MAX_BUFFER
+        if hasattr(asyncio, "timeout"):  # Python 3.11+
+            # One rescheduled deadline for the whole loop instead of a
+            # fresh wait_for task (and its timer handle) per read
+            loop = asyncio.get_running_loop()
             try:
-                output += await asyncio.wait_for(fut, self._timeout)
+                async with asyncio.timeout(self._timeout) as deadline:
+                    while True:
+                        chunk = await self._stdout.read(max_buffer)
+                        # New data arrived - push the deadline out again
+                        deadline.reschedule(loop.time() + self._timeout)
+                        chunks.append(chunk)
+                        if len(chunk) == max_buffer:
+                            max_buffer = min(_MAX_ADAPTIVE_BUFFER, max_buffer * 2)
+                        window = window[-_SCAN_OVERLAP:] + chunk
+                        # The pattern is anchored on a newline; skip the
+                        # regex entirely while none has arrived
+                        if "\n" in window and combined_re.search(window):
+                            output = "".join(chunks)
+                            if logger.isEnabledFor(logging.DEBUG):
+                                # Log only the tail; repr() of a megabyte
+                                # buffer is expensive
+                                logger.debug(
+                                    "Host %s: Reading pattern '%s' or '%s'"
+                                    " was found: %r",
+                                    self._host,
+                                    pattern,
+                                    base_pattern,
+                                    output[-200:],
+                                )
+                            return output
             except asyncio.TimeoutError:
                 raise TimeoutError(self._host)
-            if re.search("\n" + pattern, output, flags=re_flags) or re.search(
-                "\n" + base_prompt_pattern, output, flags=re_flags
-            ):
-                logger.debug(
-                    f"Host {self._host}: Reading pattern '{pattern}'"
-                    f"or '{base_prompt_pattern}' was found: {repr(output)}"
-                )
+        loop = asyncio.get_running_loop()
+        while True:
+            fut = asyncio.ensure_future(self._stdout.read(max_buffer))
+            # A plain timer handle cancelling the read replaces
+            # asyncio.wait_for and its per-read wrapping task plus
+            # done-callback machinery
+            deadline = loop.call_later(self._timeout, fut.cancel)
+            try:
+                chunk = await fut
+            except asyncio.CancelledError:
+                if fut.cancelled():
+                    raise TimeoutError(self._host)
+                raise
+            finally:
+                deadline.cancel()
+            chunks.append(chunk)
+            if len(chunk) == max_buffer:
+                max_buffer = min(_MAX_ADAPTIVE_BUFFER, max_buffer * 2)
+            window = window[-_SCAN_OVERLAP:] + chunk
+            if "\n" in window and combined_re.search(window):
+                output = "".join(chunks)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Host %s: Reading pattern '%s' or '%s' was found: %r",
+                        self._host,
+                        pattern,
+                        base_pattern,
+                        output[-200:],
+                    )
                 return output
@@ -1,3 +1,3 @@
-from .arista_eos import AristaEOS
-
-__all__ = ["AristaEOS"]
+from .arista_eos import AristaEOS
+
+__all__ = ["AristaEOS"]
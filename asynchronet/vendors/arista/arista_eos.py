@@ -1,7 +1,9 @@
-from asynchronet.vendors.ios_like import IOSLikeDevice
-
-
-class AristaEOS(IOSLikeDevice):
-    """Class for interacting with Arista EOS devices."""
-
-    pass
+from asynchronet.vendors.ios_like import IOSLikeDevice
+
+
+class AristaEOS(IOSLikeDevice):
+    """Class for interacting with Arista EOS devices."""
+
+    __slots__ = ()
+
+    pass
@@ -1,4 +1,4 @@
-from .aruba_aos_6 import ArubaAOS6
-from .aruba_aos_8 import ArubaAOS8
-
-__all__ = ["ArubaAOS6", "ArubaAOS8"]
+from .aruba_aos_6 import ArubaAOS6
+from .aruba_aos_8 import ArubaAOS8
+
+__all__ = ["ArubaAOS6", "ArubaAOS8"]
@@ -0,0 +1,66 @@
+"""
+Shared base class for Aruba AOS controllers
+
+ArubaAOS6 and ArubaAOS8 differ only in how the hostname is extracted
+from the raw prompt, so the prompt handling lives here once.
+"""
+
+import logging
+import re
+from functools import lru_cache
+
+from asynchronet.logger import logger
+from asynchronet.vendors.ios_like import IOSLikeDevice
+
+
+@lru_cache(maxsize=256)
+def _compile_base_pattern(pattern, prompt, delimiters):
+    """Compiles the formatted base pattern, memoized per prompt prefix
+
+    Fleets typically share a handful of hostname roots, so devices with
+    the same 12-character prompt prefix reuse one compiled pattern.
+    """
+    return re.compile(pattern.format(prompt=prompt, delimiters=delimiters))
+
+
+class ArubaBase(IOSLikeDevice):
+    """Base class for interacting with Aruba OS controllers"""
+
+    __slots__ = ()
+
+    # Command to disable paging
+    _disable_paging_command = "no paging"
+
+    # Command to exit from config mode to privilege exec mode
+    _config_exit = "end"
+
+    @staticmethod
+    def _prompt_transform(prompt):
+        """Extracts the base prompt (hostname) from the raw prompt"""
+        raise NotImplementedError("Attribute is not defined")
+
+    async def _set_base_prompt(self):
+        """
+        Setting two important vars:
+
+            base_prompt - textual prompt in CLI (usually hostname)
+            base_pattern - regexp for finding the end of command. (platform-specific)
+        """
+        logger.info("Host %s: Setting base prompt", self._host)
+        prompt = await self._find_prompt()
+        # Literal prompt endings for the endswith() fast path in the
+        # read loop; the regex only runs when these miss
+        self._prompt_terminators = tuple(
+            prompt[:-1] + delimiter for delimiter in type(self)._delimiter_list
+        )
+        self._base_prompt = self._prompt_transform(prompt)
+        delimiters = type(self)._get_delimiters_charclass()
+        base_prompt = re.escape(self._base_prompt[:12])
+        self._base_pattern_re = _compile_base_pattern(
+            type(self)._pattern, base_prompt, delimiters
+        )
+        self._base_pattern = self._base_pattern_re.pattern
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Host %s: Base Prompt: %s", self._host, self._base_prompt)
+            logger.debug("Host %s: Base Pattern: %s", self._host, self._base_pattern)
+        return self._base_prompt
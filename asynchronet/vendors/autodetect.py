@@ -17,16 +17,24 @@ from socket import AF_UNSPEC, AF_INET, AF_INET6
 
 from typing import Union
 import re
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional
 
 import asyncssh
 from asyncssh import SSHKnownHosts
 
 
+from asynchronet.cache import cached_send
 from asynchronet.exceptions import TimeoutError, DisconnectError
 from asynchronet.logger import logger
 from asynchronet.vendors.base import BaseDevice
 
+# Optional speedup: pyahocorasick scans a response against every literal
+# needle in one pass; without it the per-needle substring loop is used
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 SSH_MAPPER_DICT = {
     "alcatel_aos": {
         "cmd": "show system",
@@ -242,18 +250,195 @@ SSH_MAPPER_DICT = {
 
 # Sort SSH_MAPPER_DICT such that the most common commands are first
 cmd_count: Dict[str, int] = {}
-for k, v in SSH_MAPPER_DICT.items():
-    my_cmd = v["cmd"]
-    assert isinstance(my_cmd, str)
-    count = cmd_count.setdefault(my_cmd, 0)
-    cmd_count[my_cmd] = count + 1
-cmd_count = {k: v for k, v in sorted(cmd_count.items(), key=lambda item: item[1])}
-
-# SSH_MAPPER_BASE is a list
-SSH_MAPPER_BASE = sorted(
-    SSH_MAPPER_DICT.items(), key=lambda item: int(cmd_count[str(item[1]["cmd"])])
+for v in SSH_MAPPER_DICT.values():
+    cmd_count[v["cmd"]] = cmd_count.get(v["cmd"], 0) + 1
+
+# SSH_MAPPER_BASE is a list, decorated-sorted so the command frequency is
+# looked up once per entry and no separate reverse() pass is needed
+_decorated = [(cmd_count[v["cmd"]], k, v) for k, v in SSH_MAPPER_DICT.items()]
+_decorated.sort(reverse=True)
+SSH_MAPPER_BASE = [(k, v) for _, k, v in _decorated]
+
+# Compile the vendor search patterns once at import time; probing reuses
+# the same patterns for every device, so paying re.compile (or its cache
+# lookup) per probe is pure overhead
+for _autodetect_dict in SSH_MAPPER_DICT.values():
+    _autodetect_dict["search_patterns"] = [
+        re.compile(pattern, re.IGNORECASE)
+        for pattern in _autodetect_dict["search_patterns"]
+    ]
+
+# Overlap (in characters) kept when resuming a pattern scan, bounding a
+# match that straddles a read-chunk boundary
+_SCAN_OVERLAP = 256
+
+# Deletion table for backspaces; str.translate removes them in one C pass
+_BS_DELETE = str.maketrans("", "", "\x08")
+
+# ANSI escape sequences stripped from device output, combined into one
+# pattern so a single pass replaces a chain of per-code re.sub calls
+_ANSI_RE = re.compile(
+    "|".join(
+        (
+            "\x1b7",  # Save cursor position
+            "\x1b8",  # Restore cursor position
+            r"\x1b\[r",  # Scroll all screen
+            r"\x1b\[\d+A",  # Move cursor up to n cells
+            r"\x1b\[\d+B",  # Move cursor down to n cells
+            r"\x1b\[\d+;\d+H",  # Position cursor
+            r"\x1b\[\?25h",  # Show the cursor
+            r"\x1b\[K",  # Erase line from cursor
+            r"\x1b\[2K",  # Erase line
+            r"\x1b\[\d+;\d+r",  # Enable scrolling from start to row end
+        )
+    )
 )
-SSH_MAPPER_BASE.reverse()
+
+# ESC-E (next line, HP does ESC-E) becomes a newline instead
+_ANSI_NEXT_LINE_RE = re.compile("\x1bE")
+
+# Device types reported under a different name than the one probed for.
+# WLC needs two different auto-detect solutions
+_DEVICE_ALIAS = {"cisco_wlc_85": "cisco_wlc"}
+
+# Error markers returned by devices for commands they do not understand
+INVALID_RESPONSES = [
+    r"% Invalid input detected",
+    r"syntax error, expecting",
+    r"Error: Unrecognized command",
+    r"%Error",
+    r"command not found",
+    r"Syntax Error: unexpected argument",
+    r"% Unrecognized command found at",
+]
+
+# All error markers combined and compiled once; per-response scanning is
+# a single search instead of one re.search call per marker. The markers
+# are literal text, so they are escaped rather than trusted as regexes
+_INVALID_RE = re.compile(
+    "|".join(map(re.escape, INVALID_RESPONSES)), re.IGNORECASE
+)
+
+# The markers are all literal strings, so when pyahocorasick is
+# installed one automaton pass over the lowercased response replaces
+# the regex scan entirely
+_INVALID_AUTOMATON = None
+if ahocorasick is not None:
+    _INVALID_AUTOMATON = ahocorasick.Automaton()
+    for _marker in INVALID_RESPONSES:
+        _INVALID_AUTOMATON.add_word(_marker.lower(), True)
+    _INVALID_AUTOMATON.make_automaton()
+
+
+def _is_invalid_response(response: str) -> bool:
+    """True when the response contains a command-error marker"""
+    if _INVALID_AUTOMATON is not None:
+        for _ in _INVALID_AUTOMATON.iter(response.lower()):
+            return True
+        return False
+    return _INVALID_RE.search(response) is not None
+
+
+# Capturing groups inside vendor patterns would confuse match.lastgroup,
+# so demote them to non-capturing when combining
+_CAPTURING_GROUP_RE = re.compile(r"(?<!\\)\((?!\?)")
+
+
+class VendorProbe(NamedTuple):
+    """Frozen probe definition for one device_type
+
+    Attribute access on a NamedTuple is a C-level index load, unlike the
+    string-keyed dict lookups of the raw SSH_MAPPER_DICT entries.
+    """
+
+    cmd: str
+    patterns: tuple
+    priority: int
+
+
+# device_type -> VendorProbe, in SSH_MAPPER_BASE order
+VENDOR_PROBES: Dict[str, VendorProbe] = {
+    device_type: VendorProbe(
+        str(autodetect_dict["cmd"]),
+        tuple(autodetect_dict["search_patterns"]),
+        int(autodetect_dict["priority"]),
+    )
+    for device_type, autodetect_dict in SSH_MAPPER_BASE
+}
+
+# Distinct probe commands with the vendors each one identifies, in
+# SSH_MAPPER_BASE order (vendor count per command, most shared first).
+# A command is sent exactly once and every vendor sharing it is tested
+# against the single captured response
+_cmd_groups: Dict[str, list] = {}
+for _device_type, _probe in VENDOR_PROBES.items():
+    _cmd_groups.setdefault(_probe.cmd, []).append((_device_type, _probe))
+CMD_GROUPS: List[tuple] = list(_cmd_groups.items())
+
+# One combined alternation per probe command, with one named group per
+# device_type: a single regex pass over the response replaces a separate
+# scan per vendor pattern, and match.lastgroup names the winner directly
+# cmd -> [(lowercased literal, device_type)] for search patterns that
+# contain no regex metacharacters. A C-level substring test on these is
+# roughly an order of magnitude cheaper than the regex engine, and most
+# vendor banners are identified by pure literals
+_CMD_LITERALS: Dict[str, list] = {
+    cmd: [
+        (pattern.pattern.lower(), device_type)
+        for device_type, probe in entries
+        for pattern in probe.patterns
+        if re.escape(pattern.pattern) == pattern.pattern
+    ]
+    for cmd, entries in CMD_GROUPS
+}
+
+# cmd -> True when at least one of its vendor patterns needs the regex
+# engine. For commands whose patterns are all literal, a miss in the
+# substring prematch means the combined regex cannot match either and
+# is skipped outright
+_CMD_HAS_REGEX: Dict[str, bool] = {
+    cmd: any(
+        re.escape(pattern.pattern) != pattern.pattern
+        for _, probe in entries
+        for pattern in probe.patterns
+    )
+    for cmd, entries in CMD_GROUPS
+}
+
+# cmd -> Aho-Corasick automaton over that command's literal needles,
+# built only when pyahocorasick is installed. One automaton pass finds
+# any matching vendor in time proportional to the response length,
+# independent of how many vendors share the command
+_CMD_AUTOMATA: Dict[str, "ahocorasick.Automaton"] = {}
+if ahocorasick is not None:
+    for _cmd, _literals in _CMD_LITERALS.items():
+        if _literals:
+            _automaton = ahocorasick.Automaton()
+            for _needle, _device_type in _literals:
+                _automaton.add_word(_needle, _device_type)
+            _automaton.make_automaton()
+            _CMD_AUTOMATA[_cmd] = _automaton
+
+# cmd -> one alternation over every vendor pattern probed by that
+# command. This is the pure-stdlib equivalent of a multi-pattern set
+# scan (Hyperscan/RE2 style): the response is walked once per command
+# and match.lastgroup names the winning device_type
+CMD_TO_COMBINED_RE: Dict[str, re.Pattern] = {
+    cmd: re.compile(
+        "|".join(
+            "(?P<{}>{})".format(
+                device_type,
+                "|".join(
+                    _CAPTURING_GROUP_RE.sub("(?:", pattern.pattern)
+                    for pattern in probe.patterns
+                ),
+            )
+            for device_type, probe in entries
+        ),
+        re.IGNORECASE,
+    )
+    for cmd, entries in CMD_GROUPS
+}
 
 
 class SSHDetect(object):
@@ -261,6 +446,32 @@ class SSHDetect(object):
     Base Abstract Class for interacting with network devices
     """
 
+    # Slots remove the per-instance __dict__; orchestration tools spin up
+    # one SSHDetect per host, so the footprint scales with fleet size
+    __slots__ = (
+        "__weakref__",
+        "_host",
+        "_port",
+        "_device_type",
+        "_timeout",
+        "_loop",
+        "_connect_params_dict",
+        "_custom_pattern",
+        "potential_matches",
+        "_results_cache",
+        "_cmd_inflight",
+        "_stdin",
+        "_stdout",
+        "_stderr",
+        "_conn",
+        "_base_prompt",
+        "_base_pattern",
+        "_base_pattern_re",
+        "_MAX_BUFFER",
+        "_ansi_escape_codes",
+        "_cache_ttl",
+    )
+
     def __init__(
         self,
         host: str,
@@ -286,6 +497,7 @@ class SSHDetect(object):
         compression_algs: list[str] | None = None,
         signature_algs: list[str] | None = None,
         server_host_key_algs: list[str] | None = None,
+        cache_ttl: int = 0,
     ):
         """
         Initialize base class for establishing asynchronous ssh connections to devices
@@ -344,6 +556,9 @@ class SSHDetect(object):
             A list of server host key algorithms to allow during the SSH handshake,
             taken from server host key algorithms.
             https://asyncssh.readthedocs.io/en/latest/api.html#publickeyalgs
+        :param cache_ttl:
+            seconds probe responses stay valid in the on-disk cache under
+            ~/.asynchronet/cache. Default is 0 (disk caching disabled)
 
 
         :type host: str
@@ -413,8 +628,9 @@ class SSHDetect(object):
             "signature_algs": signature_algs,
         }
 
-        if pattern is not None:
-            self._pattern = pattern
+        # User-supplied prompt pattern; the class-level _pattern template
+        # cannot be shadowed per instance now that the class is slotted
+        self._custom_pattern = pattern
 
         # A list of server host key algorithms to use instead of the default of
         # those present in known_hosts when performing the SSH handshake.
@@ -423,15 +639,27 @@ class SSHDetect(object):
             self._connect_params_dict["server_host_key_algs"] = server_host_key_algs
 
         self.potential_matches: Dict[str, int] = {}
+        # Responses already collected on this connection, keyed by command
+        self._results_cache: Dict[str, str] = {}
+        # In-flight probe tasks, so concurrent requests for the same
+        # command coalesce onto one send instead of issuing duplicates
+        self._cmd_inflight: Dict[str, asyncio.Task] = {}
         # Filling internal vars
         self._stdin = self._stdout = self._stderr = self._conn = None
         self._base_prompt = self._base_pattern = ""
+        self._base_pattern_re = None
         self._MAX_BUFFER = 65535
         self._ansi_escape_codes = False
+        self._cache_ttl = cache_ttl
 
     # These characters will stop reading from buffer.(the end of the device prompt)
     _delimiter_list = [">", "#"]
 
+    # Escaped delimiter character-class body and its compiled form, built
+    # once at class definition since _delimiter_list is a class constant
+    _escaped_delimiters = "".join(map(re.escape, _delimiter_list))
+    _delimiter_pattern = re.compile("[" + _escaped_delimiters + "]")
+
     # Pattern to use when reading buffer. When found, processing ends.
     _pattern = r"{prompt}.*?(\(.*?\))?[{delimiters}]"
 
@@ -463,11 +691,11 @@ class SSHDetect(object):
         * _set_base_prompt() for finding and setting device prompt
         * _disable_paging() for non interactive output in commands
         """
-        logger.info(f"Host {self._host}: Trying to connect to the device")
+        logger.info("Host %s: Trying to connect to the device", self._host)
         await self._establish_connection()
         await self._set_base_prompt()
         await self._disable_paging()
-        logger.info(f"Host {self._host}: Has connected to the device")
+        logger.info("Host %s: Has connected to the device", self._host)
 
     async def autodetect(self) -> Union[str, None]:
         """
@@ -480,28 +708,83 @@ class SSHDetect(object):
             to interact with the device
         """
         await self.connect()
-        for device_type, autodetect_dict in SSH_MAPPER_BASE:
-            tmp_dict = autodetect_dict.copy()
-            call_method = tmp_dict.pop("dispatch")
-            assert isinstance(call_method, str)
-            autodetect_method = getattr(self, call_method)
-            accuracy = await autodetect_method(**tmp_dict)
+        # Pipeline every distinct probe command back-to-back: the shell
+        # answers in order, so each response costs server time but only
+        # the first one pays a full round trip. Truly concurrent probes
+        # (gather) are not possible on the single interactive channel,
+        # where interleaved writes would corrupt the stream
+        pending = [cmd for cmd, _ in CMD_GROUPS if cmd not in self._results_cache]
+        for cmd in pending:
+            self._stdin.write(self._normalize_cmd(cmd))
+        responses = await self._read_pipelined_responses(pending)
+        for cmd, response in responses.items():
+            self._results_cache[cmd] = self._normalize_linefeeds(response)
+        # Bind the probe method once outside the loop
+        probe = self._autodetect_combined
+        for cmd, combined_re in CMD_TO_COMBINED_RE.items():
+            device_type, accuracy = await probe(cmd, combined_re)
             if accuracy:
+                # Stop the loop as we are sure of our match; the dict is
+                # kept for debug visibility but never sorted - the first
+                # hit is the only entry that matters
                 self.potential_matches[device_type] = accuracy
-                # Stop the loop as we are sure of our match
-                best_match = sorted(
-                    self.potential_matches.items(), key=lambda t: t[1], reverse=True
-                )
-                # WLC needs two different auto-dectect solutions
-                if "cisco_wlc_85" in best_match[0]:
-                    best_match[0] = ("cisco_wlc", 99)
+                device_type = _DEVICE_ALIAS.get(device_type, device_type)
 
                 await self.disconnect()
-                return best_match[0][0]
+                return device_type
+
+    async def _read_pipelined_responses(self, pending):
+        """Reads the pipelined probe transcript and splits it per command
+
+        Responses coalesce on the channel: one read can carry several
+        short replies, prompts included, so reading one prompt per
+        command is not alignment-safe. Instead the transcript is read
+        until the last command has answered and then sliced at each
+        command's echo. Replies that cannot be delimited are simply not
+        cached; _send_command_wrapper re-probes those commands serially,
+        one write and one aligned read at a time.
+        """
+        if not pending:
+            return {}
+        buffer = ""
+        last_cmd = pending[-1]
+        delimiter_re = type(self)._delimiter_pattern
+        # Each read ends on a prompt, so len(pending) + 1 reads are
+        # enough to cover every reply plus a leading stray prompt
+        for _ in range(len(pending) + 1):
+            try:
+                chunk = await self._read_until_prompt()
+            except TimeoutError:
+                # The channel has gone quiet; deliver what arrived and
+                # let the serial path pick up the rest
+                break
+            if self._ansi_escape_codes:
+                chunk = self._strip_ansi_escape_codes(chunk)
+            buffer += chunk
+            idx = buffer.rfind(last_cmd)
+            if idx != -1 and delimiter_re.search(buffer, idx + len(last_cmd)):
+                break
+        # Slice the transcript at each echo, in send order; an echo that
+        # never shows up leaves its command to the serial fallback
+        found = []
+        search_from = 0
+        for cmd in pending:
+            idx = buffer.find(cmd, search_from)
+            if idx == -1:
+                continue
+            found.append((cmd, idx))
+            search_from = idx + len(cmd)
+        responses = {}
+        for position, (cmd, idx) in enumerate(found):
+            end = found[position + 1][1] if position + 1 < len(found) else len(buffer)
+            responses[cmd] = buffer[idx:end]
+        return responses
 
     async def _establish_connection(self):
         """Establishes SSH connection to the network device"""
-        logger.info(f"Host {self._host}: Establishing connection to port {self._port}")
+        logger.info(
+            "Host %s: Establishing connection to port %s", self._host, self._port
+        )
         output = ""
         # initiate SSH connection
         fut = asyncssh.connect(**self._connect_params_dict)
@@ -514,12 +797,10 @@ class SSHDetect(object):
         self._stdin, self._stdout, self._stderr = await self._conn.open_session(
             term_type="Dumb", term_size=(200, 24)
         )
-        logger.info(f"Host {self._host}: Connection is established")
+        logger.info("Host %s: Connection is established", self._host)
         # Flush unnecessary data
-        delimiters = map(re.escape, type(self)._delimiter_list)
-        delimiters = r"|".join(delimiters)
-        output = await self._read_until_pattern(delimiters)
-        logger.debug(f"Host {self._host}: Establish Connection Output: {repr(output)}")
+        output = await self._read_until_pattern(type(self)._delimiter_pattern)
+        logger.debug("Host %s: Establish Connection Output: %r", self._host, output)
         return output
 
     async def _set_base_prompt(self):
@@ -531,41 +812,40 @@ class SSHDetect(object):
 
         For Cisco devices base_pattern is "prompt(\(.*?\))?[#|>]
         """
-        logger.info(f"Host {self._host}: Setting base prompt")
+        logger.info("Host %s: Setting base prompt", self._host)
         prompt = await self._find_prompt()
 
         # Strip off trailing terminator
         self._base_prompt = prompt[:-1]
-        delimiters = map(re.escape, type(self)._delimiter_list)
-        delimiters = r"|".join(delimiters)
+        delimiters = type(self)._escaped_delimiters
         base_prompt = re.escape(self._base_prompt[:12])
-        pattern = type(self)._pattern
+        pattern = self._custom_pattern or type(self)._pattern
         self._base_pattern = pattern.format(prompt=base_prompt, delimiters=delimiters)
-        logger.debug(f"Host {self._host}: Base Prompt: {self._base_prompt}")
-        logger.debug(f"Host {self._host}: Base Pattern: {self._base_pattern}")
+        # Compiled once here; every subsequent buffered read reuses the
+        # object instead of hashing the string through the re cache
+        self._base_pattern_re = re.compile(self._base_pattern, re.ASCII)
+        logger.debug("Host %s: Base Prompt: %s", self._host, self._base_prompt)
+        logger.debug("Host %s: Base Pattern: %s", self._host, self._base_pattern)
         return self._base_prompt
 
     async def _disable_paging(self):
         """Disables paging method"""
-        logger.info(f"Host {self._host}: Trying to disable paging")
+        logger.info("Host %s: Trying to disable paging", self._host)
         command = type(self)._disable_paging_command
         command = self._normalize_cmd(command)
-        logger.debug(f"Host {self._host}: Disable paging command: {repr(command)}")
+        logger.debug("Host %s: Disable paging command: %r", self._host, command)
         self._stdin.write(command)
         output = await self._read_until_prompt()
-        logger.debug(f"Host {self._host}: Disable paging output: {repr(output)}")
+        logger.debug("Host %s: Disable paging output: %r", self._host, output)
         if self._ansi_escape_codes:
             output = self._strip_ansi_escape_codes(output)
         return output
 
     async def _find_prompt(self):
         """Finds the current network device prompt, last line only"""
-        logger.info(f"Host {self._host}: Finding prompt")
+        logger.info("Host %s: Finding prompt", self._host)
         self._stdin.write(self._normalize_cmd("\n"))
-        prompt = ""
-        delimiters = map(re.escape, type(self)._delimiter_list)
-        delimiters = r"|".join(delimiters)
-        prompt = await self._read_until_pattern(delimiters)
+        prompt = await self._read_until_pattern(type(self)._delimiter_pattern)
         prompt = prompt.strip()
         if self._ansi_escape_codes:
             prompt = self._strip_ansi_escape_codes(prompt)
@@ -573,7 +853,7 @@ class SSHDetect(object):
             raise ValueError(
                 f"Host {self._host}: Unable to find prompt: {repr(prompt)}"
             )
-        logger.debug(f"Host {self._host}: Found Prompt: {repr(prompt)}")
+        logger.debug("Host %s: Found Prompt: %r", self._host, prompt)
         return prompt
 
     async def _send_command(
@@ -594,10 +874,10 @@ class SSHDetect(object):
         :param bool strip_prompt: True or False for stripping ending device prompt
         :return: The output of the command
         """
-        logger.info(f"Host {self._host}: Sending command")
+        logger.info("Host %s: Sending command", self._host)
         output = ""
         command_string = self._normalize_cmd(command_string)
-        logger.debug(f"Host {self._host}: Send command: {repr(command_string)}")
+        logger.debug("Host %s: Send command: %r", self._host, command_string)
         self._stdin.write(command_string)
         output = await self._read_until_prompt_or_pattern(pattern, re_flags)
 
@@ -610,7 +890,7 @@ class SSHDetect(object):
         if strip_command:
             output = self._strip_command(command_string, output)
 
-        logger.debug(f"Host {self._host}: Send command output: {repr(output)}")
+        logger.debug("Host %s: Send command output: %r", self._host, output)
         return output
 
     async def _send_command_wrapper(self, cmd: str) -> str:
@@ -629,17 +909,31 @@ class SSHDetect(object):
         response : str
             The response from the remote device.
         """
+        # Explicit None check: an empty response is still a valid cache
+        # entry and must not trigger a resend of the same command
         cached_results = self._results_cache.get(cmd)
-        if not cached_results:
-            response = await self._send_command(cmd)
-            self._results_cache[cmd] = response
-            return response
-        else:
+        if cached_results is not None:
             return cached_results
+        # Singleflight: concurrent callers probing the same command
+        # await the task already on the wire rather than resending
+        task = self._cmd_inflight.get(cmd)
+        if task is None:
+            if self._cache_ttl:
+                coro = cached_send(
+                    self._host, cmd, self._cache_ttl, self._send_command
+                )
+            else:
+                coro = self._send_command(cmd)
+            task = asyncio.ensure_future(coro)
+            self._cmd_inflight[cmd] = task
+            task.add_done_callback(lambda _: self._cmd_inflight.pop(cmd, None))
+        response = await task
+        self._results_cache[cmd] = response
+        return response
 
     def _strip_prompt(self, a_string):
         """Strip the trailing router prompt from the output"""
-        logger.info(f"Host {self._host}: Stripping prompt")
+        logger.info("Host %s: Stripping prompt", self._host)
         response_list = a_string.split("\n")
         last_line = response_list[-1]
         if self._base_prompt in last_line:
@@ -652,61 +946,99 @@ class SSHDetect(object):
 
         Returns all data available.
         """
-        return await self._read_until_pattern(self._base_pattern)
+        return await self._read_until_pattern(
+            self._base_pattern_re or self._base_pattern
+        )
 
     async def _read_until_pattern(self, pattern="", re_flags=0):
         """Reads channel until pattern detected.
 
         Returns all data available.
         """
-        output = ""
-        logger.info(f"Host {self._host}: Reading until pattern")
+        logger.info("Host %s: Reading until pattern", self._host)
         if not pattern:
             pattern = self._base_pattern
-        logger.debug(f"Host {self._host}: Reading pattern: {pattern}")
-        while True:
-            fut = self._stdout.read(self._MAX_BUFFER)
-            try:
-                output += await asyncio.wait_for(fut, self._timeout)
-            except asyncio.TimeoutError:
-                raise TimeoutError(self._host)
-            if re.search(pattern, output, flags=re_flags):
-                logger.debug(
-                    f"Host {self._host}: Reading pattern '{pattern}' was found:"
-                    f"{repr(output)}"
-                )
-                return output
+        # Accept either a pattern string or an already compiled pattern
+        if isinstance(pattern, re.Pattern):
+            compiled = pattern
+            pattern = compiled.pattern
+        else:
+            compiled = re.compile(pattern, re_flags)
+        logger.debug("Host %s: Reading pattern: %s", self._host, pattern)
+        output = await self._read_until_re(compiled)
+        logger.debug(
+            "Host %s: Reading pattern '%s' was found:%r",
+            self._host,
+            pattern,
+            output,
+        )
+        return output
 
     async def _read_until_prompt_or_pattern(self, pattern="", re_flags=0):
         """Reads until either self.base_pattern or pattern is detected.
 
         Returns all data available
         """
-        output = ""
-        logger.info(f"Host {self._host}: Reading until prompt or pattern")
-        if not pattern:
-            pattern = self._base_pattern
+        logger.info("Host %s: Reading until prompt or pattern", self._host)
         base_prompt_pattern = self._base_pattern
+        # One combined compiled pattern halves the scans per read
+        if not pattern or pattern == base_prompt_pattern:
+            combined = self._base_pattern_re
+            if combined is None or re_flags:
+                combined = re.compile(base_prompt_pattern, re_flags)
+        else:
+            combined = re.compile(
+                f"(?:{pattern})|(?:{base_prompt_pattern})", re_flags
+            )
+        output = await self._read_until_re(combined)
+        logger.debug(
+            "Host %s: Reading pattern '%s' or'%s' was found: %r",
+            self._host,
+            pattern,
+            base_prompt_pattern,
+            output,
+        )
+        return output
+
+    async def _read_until_re(self, compiled: re.Pattern) -> str:
+        """Reads the channel until the compiled pattern matches.
+
+        Collects chunks in a list and joins once on return; repeated str
+        concatenation would copy the whole buffer on every read. The
+        scan runs on a rolling window of the new chunk plus a small
+        overlap so each character is inspected a bounded number of times.
+        """
+        chunks = []
+        window = ""
+        if hasattr(asyncio, "timeout"):  # Python 3.11+
+            # One deadline scoping the whole read instead of a wait_for
+            # task per chunk; this also bounds total time on devices
+            # that dribble data and kept resetting per-read timeouts
+            try:
+                async with asyncio.timeout(self._timeout):
+                    while True:
+                        chunk = await self._stdout.read(self._MAX_BUFFER)
+                        chunks.append(chunk)
+                        window = window[-_SCAN_OVERLAP:] + chunk
+                        if compiled.search(window):
+                            return "".join(chunks)
+            except asyncio.TimeoutError:
+                raise TimeoutError(self._host)
         while True:
             fut = self._stdout.read(self._MAX_BUFFER)
             try:
-                output += await asyncio.wait_for(fut, self._timeout)
+                chunk = await asyncio.wait_for(fut, self._timeout)
             except asyncio.TimeoutError:
                 raise TimeoutError(self._host)
-            if re.search(pattern, output, flags=re_flags) or re.search(
-                base_prompt_pattern, output, flags=re_flags
-            ):
-                logger.debug(
-                    f"Host {self._host}: Reading pattern '{pattern}' or"
-                    f"'{base_prompt_pattern}' was found: {repr(output)}"
-                )
-                return output
+            chunks.append(chunk)
+            window = window[-_SCAN_OVERLAP:] + chunk
+            if compiled.search(window):
+                return "".join(chunks)
 
     @staticmethod
     def _strip_backspaces(output):
         """Strip any backspace characters out of the output"""
-        backspace_char = "\x08"
-        return output.replace(backspace_char, "")
+        return output.translate(_BS_DELETE)
 
     @staticmethod
     def _strip_command(command_string, output):
@@ -715,14 +1047,13 @@ class SSHDetect(object):
         Cisco IOS adds backspaces into output for long commands
         """
         logger.info("Stripping command")
-        backspace_char = "\x08"
 
         # Check for line wrap (remove backspaces)
-        if backspace_char in output:
-            output = output.replace(backspace_char, "")
-            output_lines = output.split("\n")
-            new_output = output_lines[1:]
-            return "\n".join(new_output)
+        if "\x08" in output:
+            # translate deletes in a single pass; partition drops the
+            # echoed first line without building a full line list
+            output = output.translate(_BS_DELETE)
+            return output.partition("\n")[2]
         else:
             command_length = len(command_string)
             return output[command_length:]
@@ -730,8 +1061,13 @@ class SSHDetect(object):
     @staticmethod
     def _normalize_linefeeds(a_string):
         """Convert '\r\r\n','\r\n', '\n\r' to '\n"""
-        newline = re.compile(r"(\r\r\n|\r\n|\n\r)")
-        return newline.sub("\n", a_string)
+        # Three chained C-level replaces beat a regex alternation here;
+        # order matters so '\r\r\n' collapses before '\r\n' is handled
+        return (
+            a_string.replace("\r\r\n", "\n")
+            .replace("\r\n", "\n")
+            .replace("\n\r", "\n")
+        )
 
     @staticmethod
     def _normalize_cmd(command):
@@ -750,7 +1086,7 @@ class SSHDetect(object):
         network device
         :return: The output of this commands
         """
-        logger.info(f"Host {self._host}: Sending configuration settings")
+        logger.info("Host %s: Sending configuration settings", self._host)
         if config_commands is None:
             return ""
         if not hasattr(config_commands, "__iter__"):
@@ -759,7 +1095,7 @@ class SSHDetect(object):
             )
 
         # Send config commands
-        logger.debug(f"Host {self._host}: Config commands: {config_commands}")
+        logger.debug("Host %s: Config commands: %s", self._host, config_commands)
         output = ""
         for cmd in config_commands:
             self._stdin.write(self._normalize_cmd(cmd))
@@ -769,7 +1105,7 @@ class SSHDetect(object):
             output = self._strip_ansi_escape_codes(output)
 
         output = self._normalize_linefeeds(output)
-        logger.debug(f"Host {self._host}: Config commands output: {repr(output)}")
+        logger.debug("Host %s: Config commands output: %r", self._host, output)
         return output
 
     @staticmethod
@@ -803,49 +1139,24 @@ class SSHDetect(object):
             Mikrotik
         """
         logger.info("Stripping ansi escape codes")
-        logger.debug(f"Unstripped output: {repr(string_buffer)}")
-
-        code_save_cursor = chr(27) + r"7"
-        code_scroll_screen = chr(27) + r"\[r"
-        code_restore_cursor = chr(27) + r"8"
-        code_cursor_up = chr(27) + r"\[\d+A"
-        code_cursor_down = chr(27) + r"\[\d+B"
-
-        code_position_cursor = chr(27) + r"\[\d+;\d+H"
-        code_show_cursor = chr(27) + r"\[\?25h"
-        code_next_line = chr(27) + r"E"
-        code_erase_line_from_cursor = chr(27) + r"\[K"
-        code_erase_line = chr(27) + r"\[2K"
-        code_enable_scroll = chr(27) + r"\[\d+;\d+r"
-
-        code_set = [
-            code_save_cursor,
-            code_scroll_screen,
-            code_restore_cursor,
-            code_cursor_up,
-            code_cursor_down,
-            code_position_cursor,
-            code_show_cursor,
-            code_erase_line,
-            code_erase_line_from_cursor,
-            code_enable_scroll,
-        ]
-
-        output = string_buffer
-        for ansi_esc_code in code_set:
-            output = re.sub(ansi_esc_code, "", output)
+        # Most devices never emit ESC at all; one C-level substring scan
+        # skips both regex passes (and the debug formatting) entirely
+        if "\x1b" not in string_buffer:
+            return string_buffer
+        logger.debug("Unstripped output: %r", string_buffer)
 
+        output = _ANSI_RE.sub("", string_buffer)
         # CODE_NEXT_LINE must substitute with '\n'
-        output = re.sub(code_next_line, "\n", output)
+        output = _ANSI_NEXT_LINE_RE.sub("\n", output)
 
-        logger.debug(f"Stripped output: {repr(output)}")
+        logger.debug("Stripped output: %r", output)
 
         return output
 
     async def _autodetect_std(
         self,
         cmd: str = "",
-        search_patterns: Optional[List[str]] = None,
+        search_patterns: Optional[List[re.Pattern]] = None,
         re_flags: int = re.IGNORECASE,
         priority: int = 99,
     ) -> int:
@@ -862,49 +1173,84 @@ class SSHDetect(object):
         cmd : str
             The command to send to the remote device after checking cache.
         search_patterns : list
-            A list of regular expression to look for in the command's output
-            (default: None).
+            A list of compiled regular expressions to look for in the
+            command's output (default: None).
         re_flags: re.flags, optional
             Any flags from the python re module to modify the regular expression
             (default: re.I).
         priority: int, optional
             The confidence the match is right between 0 and 99 (default: 99).
         """
-        invalid_responses = [
-            r"% Invalid input detected",
-            r"syntax error, expecting",
-            r"Error: Unrecognized command",
-            r"%Error",
-            r"command not found",
-            r"Syntax Error: unexpected argument",
-            r"% Unrecognized command found at",
-        ]
         if not cmd or not search_patterns:
             return 0
         try:
             # _send_command_wrapper will use already cached results if available
-            response = await self._send_command(cmd)
+            response = await self._send_command_wrapper(cmd)
             # Look for error conditions in output
-            for pattern in invalid_responses:
-                match = re.search(pattern, response, flags=re.I)
-                if match:
-                    return 0
+            if _is_invalid_response(response):
+                return 0
             for pattern in search_patterns:
-                match = re.search(pattern, response, flags=re_flags)
-                if match:
+                if pattern.search(response):
                     return priority
         except Exception:
             return 0
         return 0
 
+    async def _autodetect_combined(self, cmd: str, combined_re: re.Pattern):
+        """
+        Probes the device with cmd and matches the response against the
+        combined per-command pattern from CMD_TO_COMBINED_RE in one pass.
+
+        Parameters
+        ----------
+        cmd : str
+            The command to send to the remote device after checking cache.
+        combined_re : re.Pattern
+            Alternation of every vendor pattern probed by cmd, one named
+            group per device_type.
+
+        Returns
+        -------
+        (device_type, priority) : tuple
+            The matched device_type and its confidence, or (None, 0).
+        """
+        try:
+            # _send_command_wrapper will use already cached results if available
+            response = await self._send_command_wrapper(cmd)
+        except Exception:
+            return None, 0
+        # Look for error conditions in output
+        if _is_invalid_response(response):
+            return None, 0
+        # Literal fast path: patterns without metacharacters are tested
+        # with a plain substring scan before the regex engine runs
+        lowered = response.lower()
+        automaton = _CMD_AUTOMATA.get(cmd)
+        if automaton is not None:
+            for _, device_type in automaton.iter(lowered):
+                return device_type, VENDOR_PROBES[device_type].priority
+        else:
+            for needle, device_type in _CMD_LITERALS[cmd]:
+                if needle in lowered:
+                    return device_type, VENDOR_PROBES[device_type].priority
+        # Prematch gate: when every pattern for this command is literal,
+        # a substring miss already proves the regex cannot match
+        if not _CMD_HAS_REGEX[cmd]:
+            return None, 0
+        match = combined_re.search(response)
+        if match:
+            device_type = match.lastgroup
+            return device_type, VENDOR_PROBES[device_type].priority
+        return None, 0
+
     async def _cleanup(self):
         """Any needed cleanup before closing connection"""
-        logger.info(f"Host {self._host}: Cleanup session")
+        logger.info("Host %s: Cleanup session", self._host)
         pass
 
     async def disconnect(self):
         """Gracefully close the SSH connection"""
-        logger.info(f"Host {self._host}: Disconnecting")
+        logger.info("Host %s: Disconnecting", self._host)
         await self._cleanup()
         self._conn.close()
         await self._conn.wait_closed()
@@ -1,7 +1,7 @@
-from .cisco_asa import CiscoASA
-from .cisco_ios import CiscoIOS
-from .cisco_iosxr import CiscoIOSXR
-from .cisco_nxos import CiscoNXOS
-from .cisco_sg3xx import CiscoSG3XX
-
-__all__ = ["CiscoIOS", "CiscoIOSXR", "CiscoASA", "CiscoNXOS", "CiscoSG3XX"]
+from .cisco_asa import CiscoASA
+from .cisco_ios import CiscoIOS
+from .cisco_iosxr import CiscoIOSXR
+from .cisco_nxos import CiscoNXOS
+from .cisco_sg3xx import CiscoSG3XX
+
+__all__ = ["CiscoIOS", "CiscoIOSXR", "CiscoASA", "CiscoNXOS", "CiscoSG3XX"]
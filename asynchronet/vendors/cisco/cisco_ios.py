@@ -1,14 +1,16 @@
-"""
-Cisco IOS support
-
-For use with Cisco IOS Devices
-
-"""
-
-from asynchronet.vendors.ios_like import IOSLikeDevice
-
-
-class CiscoIOS(IOSLikeDevice):
-    """Class for interating with Cisco IOS/IOS-XE devices."""
-
-    pass
+"""
+Cisco IOS support
+
+For use with Cisco IOS Devices
+
+"""
+
+from asynchronet.vendors.ios_like import IOSLikeDevice
+
+
+class CiscoIOS(IOSLikeDevice):
+    """Class for interating with Cisco IOS/IOS-XE devices."""
+
+    __slots__ = ()
+
+    pass
@@ -1,23 +1,37 @@
-"""
-Cisco Nexus support
-
-For use with Cisco Nexus/NX-OS Devices
-
-"""
-
-import re
-
-from asynchronet.vendors.ios_like import IOSLikeDevice
-
-
-class CiscoNXOS(IOSLikeDevice):
-    """Class for interacting with Cisco Nexus/NX-OS devices"""
-
-    @staticmethod
-    def _normalize_linefeeds(a_string):
-        """
-        Convert '\r\n' or '\r\r\n' to '\n, and remove extra '\r's in the text
-        """
-        newline = re.compile(r"(\r\r\n|\r\n)")
-
-        return newline.sub("\n", a_string).replace("\r", "")
+"""
+Cisco Nexus support
+
+For use with Cisco Nexus/NX-OS Devices
+
+"""
+
+import re
+
+from asynchronet.vendors.ios_like import IOSLikeDevice
+
+# Compiled once; _normalize_linefeeds runs on every command response.
+# One alternation covers both the newline variants and stray '\r', so a
+# single pass replaces the old normalize-then-strip sequence
+_NORM_RE = re.compile(r"\r\r\n|\r\n|\r")
+_NORM_MAP = {"\r\r\n": "\n", "\r\n": "\n", "\r": ""}
+
+
+def _norm_repl(match):
+    """Maps each matched linefeed variant to its replacement"""
+    return _NORM_MAP[match.group(0)]
+
+
+class CiscoNXOS(IOSLikeDevice):
+    """Class for interacting with Cisco Nexus/NX-OS devices"""
+
+    __slots__ = ()
+
+    @staticmethod
+    def _normalize_linefeeds(a_string):
+        """
+        Convert '\r\n' or '\r\r\n' to '\n, and remove extra '\r's in the text
+        """
+        # Fast path: no carriage return means nothing to normalize
+        if "\r" not in a_string:
+            return a_string
+        return _NORM_RE.sub(_norm_repl, a_string)
@@ -10,6 +10,8 @@ from asynchronet.vendors.ios_like import IOSLikeDevice
 class CiscoSG3XX(IOSLikeDevice):
     """Class for interacting with Cisco SG3XX devices."""
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         """
         Initialize class for asynchronous working with network devices
@@ -1,3 +1,3 @@
-from .fujitsu_switch import FujitsuSwitch
-
-__all__ = ["FujitsuSwitch"]
+from .fujitsu_switch import FujitsuSwitch
+
+__all__ = ["FujitsuSwitch"]
@@ -1,52 +1,63 @@
-"""
-Fujitsu Switch support
-
-For use with Fujitsu Blade Switches
-
-"""
-import re
-
-from asynchronet.logger import logger
-from asynchronet.vendors.ios_like import IOSLikeDevice
-
-
-class FujitsuSwitch(IOSLikeDevice):
-    """Class for working with Fujitsu Blade switch"""
-
-    # Pattern to use when reading buffer. When found, processing ends.
-    _pattern = r"\({prompt}.*?\) (\(.*?\))?[{delimiters}]"
-
-    # Command to disable paging
-    _disable_paging_command = "no pager"
-
-    # Command to enter configuration mode
-    _config_enter = "conf"
-
-    async def _set_base_prompt(self):
-        """
-        Setting two important vars
-            base_prompt - textual prompt in CLI (usually hostname)
-            base_pattern - regexp for finding the end of command. (platform-specific)
-
-        For Fujitsu devices base_pattern is "(prompt) (\(.*?\))?[>|#]"
-        """
-        logger.info(f"Host {self._host}: Setting base prompt")
-        prompt = await self._find_prompt()
-        # Strip off trailing terminator
-        self._base_prompt = prompt[1:-3]
-        delimiters = map(re.escape, type(self)._delimiter_list)
-        delimiters = r"|".join(delimiters)
-        base_prompt = re.escape(self._base_prompt[:12])
-        pattern = type(self)._pattern
-        self._base_pattern = pattern.format(prompt=base_prompt, delimiters=delimiters)
-        logger.debug(f"Host {self._host}: Base Prompt: {self._base_prompt}")
-        logger.debug(f"Host {self._host}: Base Pattern: {self._base_pattern}")
-        return self._base_prompt
-
-    @staticmethod
-    def _normalize_linefeeds(a_string):
-        """
-        Convert '\r\r\n','\r\n', '\n\r' to '\n and remove extra '\n\n' in the text
-        """
-        newline = re.compile(r"(\r\r\n|\r\n|\n\r)")
-        return newline.sub("\n", a_string).replace("\n\n", "\n")
+"""
+Fujitsu Switch support
+
+For use with Fujitsu Blade Switches
+
+"""
+import re
+
+from asynchronet.logger import logger
+from asynchronet.vendors.ios_like import IOSLikeDevice
+
+# Compiled once; _normalize_linefeeds runs on every command response.
+# Any run of line-break sequences collapses to a single '\n', folding
+# the newline normalization and the blank-line collapse into one pass
+_NORM_RE = re.compile(r"(?:\r\r\n|\r\n|\n\r|\n)+")
+
+
+class FujitsuSwitch(IOSLikeDevice):
+    """Class for working with Fujitsu Blade switch"""
+
+    __slots__ = ()
+
+    # Pattern to use when reading buffer. When found, processing ends.
+    _pattern = r"\({prompt}.*?\) (\(.*?\))?[{delimiters}]"
+
+    # Command to disable paging
+    _disable_paging_command = "no pager"
+
+    # Command to enter configuration mode
+    _config_enter = "conf"
+
+    async def _set_base_prompt(self):
+        """
+        Setting two important vars
+            base_prompt - textual prompt in CLI (usually hostname)
+            base_pattern - regexp for finding the end of command. (platform-specific)
+
+        For Fujitsu devices base_pattern is "(prompt) (\(.*?\))?[>|#]"
+        """
+        logger.info("Host %s: Setting base prompt", self._host)
+        prompt = await self._find_prompt()
+        # Strip off trailing terminator
+        self._base_prompt = prompt[1:-3]
+        delimiters = self._get_delimiters_charclass()
+        base_prompt = re.escape(self._base_prompt[:12])
+        pattern = type(self)._pattern
+        self._base_pattern = pattern.format(prompt=base_prompt, delimiters=delimiters)
+        # Compiled once per session for the read loops
+        self._base_pattern_re = re.compile(self._base_pattern, re.ASCII)
+        logger.debug("Host %s: Base Prompt: %s", self._host, self._base_prompt)
+        logger.debug("Host %s: Base Pattern: %s", self._host, self._base_pattern)
+        return self._base_prompt
+
+    @staticmethod
+    def _normalize_linefeeds(a_string):
+        """
+        Convert '\r\r\n','\r\n', '\n\r' to '\n and remove extra '\n\n' in the text
+        """
+        # Fast path: without '\r' or doubled newlines there is nothing
+        # to normalize; both checks are single memchr-style scans
+        if "\r" not in a_string and "\n\n" not in a_string:
+            return a_string
+        return _NORM_RE.sub("\n", a_string)
@@ -1,4 +1,4 @@
-from .hp_comware import HPComware
-from .hp_comware_limited import HPComwareLimited
-
-__all__ = ["HPComware", "HPComwareLimited"]
+from .hp_comware import HPComware
+from .hp_comware_limited import HPComwareLimited
+
+__all__ = ["HPComware", "HPComwareLimited"]
@@ -1,13 +1,15 @@
-"""
-HP Comware Support
-
-For use with HP Comware Devices
-
-"""
-from asynchronet.vendors.comware_like import ComwareLikeDevice
-
-
-class HPComware(ComwareLikeDevice):
-    """Class for interacting with HP Comware devices."""
-
-    pass
+"""
+HP Comware Support
+
+For use with HP Comware Devices
+
+"""
+from asynchronet.vendors.comware_like import ComwareLikeDevice
+
+
+class HPComware(ComwareLikeDevice):
+    """Class for interacting with HP Comware devices."""
+
+    __slots__ = ()
+
+    pass
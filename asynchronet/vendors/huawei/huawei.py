@@ -13,6 +13,8 @@ from asynchronet.logger import logger
 class Huawei(ComwareLikeDevice):
     """Class for interacting with Huawei devices."""
 
+    __slots__ = ()
+
     # Command to disable paging
     _disable_paging_command = "screen-length 0 temporary"
 
@@ -24,16 +26,17 @@ class Huawei(ComwareLikeDevice):
 
         For Comware devices base_pattern is "[\]|>]prompt(\-\w+)?[\]|>]
         """
-        logger.info(f"Host {self._host}: Setting base prompt")
+        logger.info("Host %s: Setting base prompt", self._host)
         prompt = await self._find_prompt()
-        # Strip off any leading HRP_. characters for USGv5 HA
-        prompt = re.sub(r"^HRP_.", "", prompt, flags=re.M)
+        # Strip off any leading HRP_. characters for USGv5 HA. The
+        # prompt is a single line, so a startswith slice replaces the
+        # multiline regex the original used
+        if prompt.startswith("HRP_"):
+            prompt = prompt[5:]
         # Strip off trailing terminator
         self._base_prompt = prompt[1:-1]
-        delimiter_right = map(re.escape, type(self)._delimiter_list)
-        delimiter_right = r"|".join(delimiter_right)
-        delimiter_left = map(re.escape, type(self)._delimiter_left_list)
-        delimiter_left = r"|".join(delimiter_left)
+        delimiter_right = self._get_delimiters_charclass()
+        delimiter_left = self._get_escaped_left_delimiters()
         base_prompt = re.escape(self._base_prompt[:12])
         pattern = type(self)._pattern
         self._base_pattern = pattern.format(
@@ -41,6 +44,8 @@ class Huawei(ComwareLikeDevice):
             prompt=base_prompt,
             delimiter_right=delimiter_right,
         )
-        logger.debug(f"Host {self._host}: Base Prompt: {self._base_prompt}")
-        logger.debug(f"Host {self._host}: Base Pattern: {self._base_pattern}")
+        # Compiled once per session for the read loops
+        self._base_pattern_re = re.compile(self._base_pattern, re.ASCII)
+        logger.debug("Host %s: Base Prompt: %s", self._host, self._base_prompt)
+        logger.debug("Host %s: Base Pattern: %s", self._host, self._base_pattern)
         return self._base_prompt
@@ -1,3 +1,3 @@
-from .HW1000 import HW1000
-
-__all__ = ['HW1000']
+from .HW1000 import HW1000
+
+__all__ = ['HW1000']
@@ -1,3 +1,3 @@
-from .juniper_junos import JuniperJunOS
-
-__all__ = ["JuniperJunOS"]
+from .juniper_junos import JuniperJunOS
+
+__all__ = ["JuniperJunOS"]
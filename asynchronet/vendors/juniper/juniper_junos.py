@@ -1,59 +1,71 @@
-"""
-Juiper JunOS Support
-
-For use with Juniper JunOS Devices
-
-"""
-
-from asynchronet.logger import logger
-from asynchronet.vendors.junos_like import JunOSLikeDevice
-
-
-class JuniperJunOS(JunOSLikeDevice):
-    """Class for working interacting Juniper JunOS devices"""
-
-    # String to check for shell mode
-    _cli_check = ">"
-
-    # Command to enter CLI mode
-    _cli_command = "cli"
-
-    async def connect(self):
-        """
-        Juniper JunOS asynchronous connection method
-
-        It connects to device and makes some preparation steps for working:
-
-        * _establish_connection() for connecting to device
-        * cli_mode() for checking shell mode. If in shell - automatically enter CLI
-        * _set_base_prompt() for finding and setting device prompt
-        * _disable_paging() for non interact output in commands
-        """
-        logger.info(f"Host {self._host}: Trying to connect to the device")
-        await self._establish_connection()
-        await self._set_base_prompt()
-        await self.cli_mode()
-        await self._disable_paging()
-        logger.info(f"Host {self._host}: Entering to cmdline mode")
-
-    async def check_cli_mode(self):
-        """Check if in CLI mode
-
-        Return boolean"""
-        logger.info(f"Host {self._host}: Checking shell mode")
-        cli_check = type(self)._cli_check
-        self._stdin.write(self._normalize_cmd("\n"))
-        output = await self._read_until_prompt()
-        return cli_check in output
-
-    async def cli_mode(self):
-        """Enter CLI mode"""
-        logger.info(f"Host {self._host}: Entering to cli mode")
-        output = ""
-        cli_command = type(self)._cli_command
-        if not await self.check_cli_mode():
-            self._stdin.write(self._normalize_cmd(cli_command))
-            output += await self._read_until_prompt()
-            if not await self.check_cli_mode():
-                raise ValueError("Failed to enter to cli mode")
-        return output
+"""
+Juiper JunOS Support
+
+For use with Juniper JunOS Devices
+
+"""
+
+from asynchronet.logger import logger
+from asynchronet.vendors.junos_like import JunOSLikeDevice
+
+
+class JuniperJunOS(JunOSLikeDevice):
+    """Class for working interacting Juniper JunOS devices"""
+
+    __slots__ = ()
+
+    # String to check for shell mode
+    _cli_check = ">"
+
+    # Command to enter CLI mode
+    _cli_command = "cli"
+
+    async def connect(self):
+        """
+        Juniper JunOS asynchronous connection method
+
+        It connects to device and makes some preparation steps for working:
+
+        * _establish_connection() for connecting to device
+        * cli_mode() for checking shell mode. If in shell - automatically enter CLI
+        * _set_base_prompt() for finding and setting device prompt
+        * _disable_paging() for non interact output in commands
+        """
+        logger.info("Host %s: Trying to connect to the device", self._host)
+        await self._establish_connection()
+        await self._set_base_prompt()
+        await self.cli_mode()
+        await self._disable_paging()
+        logger.info("Host %s: Entering to cmdline mode", self._host)
+
+    async def check_cli_mode(self):
+        """Check if in CLI mode
+
+        Return boolean"""
+        logger.info("Host %s: Checking shell mode", self._host)
+        cli_check = self._cli_check
+        self._stdin.write(self._normalize_cmd("\n"))
+        output = await self._read_until_prompt()
+        # The mode marker only appears in the trailing prompt line
+        return cli_check in output.rsplit("\n", 1)[-1]
+
+    async def cli_mode(self):
+        """Enter CLI mode"""
+        logger.info("Host %s: Entering to cli mode", self._host)
+        output = ""
+        cli_command = self._cli_command
+        # Reuse the prompt _set_base_prompt just read instead of probing
+        # again; consumed once because the mode can change later
+        last_terminator = self._last_prompt_terminator
+        self._last_prompt_terminator = ""
+        if last_terminator == self._cli_check:
+            return output
+        if not await self.check_cli_mode():
+            self._stdin.write(self._normalize_cmd(cli_command))
+            output += await self._read_until_prompt()
+            # The echoed prompt already shows the resulting mode; only
+            # re-probe when it is inconclusive
+            if self._cli_check not in output.rsplit("\n", 1)[-1]:
+                if not await self.check_cli_mode():
+                    raise ValueError("Failed to enter to cli mode")
+        return output
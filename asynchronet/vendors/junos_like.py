@@ -1,150 +1,166 @@
-"""
-JunOSLikeDevice Class is abstract class for JunOS-like devices
-
-Connection Methods are based on AsyncSSH and should be run in an asyncio loop
-"""
-
-import re
-
-from asynchronet.logger import logger
-from asynchronet.vendors.base import BaseDevice
-
-
-class JunOSLikeDevice(BaseDevice):
-    """
-    JunOSLikeDevice Class for working with JunOS-like devices
-
-    Juniper JunOS like devices typically have the following:
-
-    * shell mode (csh).
-        This is csh shell for FreeBSD. This mode is not covered by this Class.
-    * cli mode (specific shell).
-        The entire configuration is usual configured in this shell
-
-    * operation mode.
-        This mode is using for getting information from device
-    * configuration mode.
-        This mode is using for configuration system
-    """
-
-    # These characters will stop reading from buffer.(the end of the device prompt)
-    _delimiter_list = ["%", ">", "#"]
-
-    # Pattern to use when reading buffer. When found, processing ends.
-    _pattern = r"\w+(\@[\-\w]*)?[{delimiters}]"
-
-    # Command to disable paging
-    _disable_paging_command = "set cli screen-length 0"
-
-    # Command to enter configuration mode
-    _config_enter = "configure"
-
-    # Command to exit configuration mode & enter privilege exec mode
-    _config_exit = "exit configuration-mode"
-
-    # String to check in prompt = If exists - we're in configuration mode
-    _config_check = "#"
-
-    # Command to commit changes
-    _commit_command = "commit"
-
-    # Command to commit changes with a comment
-    _commit_comment_command = "commit comment {}"
-
-    async def _set_base_prompt(self):
-        """
-        Setting two important vars
-            base_prompt - textual prompt in CLI (usually username or hostname)
-            base_pattern - regexp for finding the end of command. (platform-specific)
-
-        For JunOS devices base_pattern is "user(@[hostname])?[>|#]
-        """
-        logger.info(f"Host {self._host}: Setting base prompt")
-        prompt = await self._find_prompt()
-        prompt = prompt[:-1]
-        # Strip off trailing terminator
-        if "@" in prompt:
-            prompt = prompt.split("@")[1]
-        self._base_prompt = prompt
-        delimiters = map(re.escape, type(self)._delimiter_list)
-        delimiters = r"|".join(delimiters)
-        pattern = type(self)._pattern
-        self._base_pattern = pattern.format(delimiters=delimiters)
-        logger.debug(f"Host {self._host}: Base Prompt: {self._base_prompt}")
-        logger.debug(f"Host {self._host}: Base Pattern: {self._base_pattern}")
-        return self._base_prompt
-
-    async def check_config_mode(self):
-        """Checks if in configuration mode.
-
-        Returns boolean"""
-        logger.info(f"Host {self._host}: Checking configuration mode")
-        check_string = type(self)._config_check
-        self._stdin.write(self._normalize_cmd("\n"))
-        output = await self._read_until_prompt()
-        return check_string in output
-
-    async def config_mode(self):
-        """Enters configuration mode"""
-        logger.info(f"Host {self._host}: Entering to configuration mode")
-        output = ""
-        config_enter = type(self)._config_enter
-        if not await self.check_config_mode():
-            self._stdin.write(self._normalize_cmd(config_enter))
-            output += await self._read_until_prompt()
-            if not await self.check_config_mode():
-                raise ValueError("Failed to enter to configuration mode")
-        return output
-
-    async def exit_config_mode(self):
-        """Exits from configuration mode"""
-        logger.info(f"Host {self._host}: Exiting from configuration mode")
-        output = ""
-        config_exit = type(self)._config_exit
-        if await self.check_config_mode():
-            self._stdin.write(self._normalize_cmd(config_exit))
-            output += await self._read_until_prompt()
-            if await self.check_config_mode():
-                raise ValueError("Failed to exit from configuration mode")
-        return output
-
-    async def send_config_set(
-        self,
-        config_commands=None,
-        with_commit=True,
-        commit_comment="",
-        exit_config_mode=True,
-    ):
-        """
-        Sending configuration commands to device
-        By default automatically exits/enters configuration mode.
-
-        :param list config_commands: iterable string list with commands to apply
-        to network devices in system view
-        :param bool with_commit: if true, commits all changes after applying
-        all config_commands
-        :param string commit_comment: message for configuration commit
-        :param bool exit_config_mode: If true, automatically quick configuration mode
-        :return: The output of these commands
-        """
-
-        if config_commands is None:
-            return ""
-
-        # Send config commands
-        output = await self.config_mode()
-        output += await super().send_config_set(config_commands=config_commands)
-        if with_commit:
-            commit = type(self)._commit_command
-            if commit_comment:
-                commit = type(self)._commit_comment_command.format(commit_comment)
-
-            self._stdin.write(self._normalize_cmd(commit))
-            output += await self._read_until_prompt()
-
-        if exit_config_mode:
-            output += await self.exit_config_mode()
-
-        output = self._normalize_linefeeds(output)
-        logger.debug(f"Host {self._host}: Config commands output: {repr(output)}")
-        return output
+"""
+JunOSLikeDevice Class is abstract class for JunOS-like devices
+
+Connection Methods are based on AsyncSSH and should be run in an asyncio loop
+"""
+
+import re
+
+from asynchronet.logger import logger
+from asynchronet.vendors.base import BaseDevice
+
+
+class JunOSLikeDevice(BaseDevice):
+    """
+    JunOSLikeDevice Class for working with JunOS-like devices
+
+    Juniper JunOS like devices typically have the following:
+
+    * shell mode (csh).
+        This is csh shell for FreeBSD. This mode is not covered by this Class.
+    * cli mode (specific shell).
+        The entire configuration is usual configured in this shell
+
+    * operation mode.
+        This mode is using for getting information from device
+    * configuration mode.
+        This mode is using for configuration system
+    """
+
+    __slots__ = ()
+
+    # These characters will stop reading from buffer.(the end of the device prompt)
+    _delimiter_list = ["%", ">", "#"]
+
+    # Pattern to use when reading buffer. When found, processing ends.
+    _pattern = r"\w+(\@[\-\w]*)?[{delimiters}]"
+
+    # Command to disable paging
+    _disable_paging_command = "set cli screen-length 0"
+
+    # Command to enter configuration mode
+    _config_enter = "configure"
+
+    # Command to exit configuration mode & enter privilege exec mode
+    _config_exit = "exit configuration-mode"
+
+    # String to check in prompt = If exists - we're in configuration mode
+    _config_check = "#"
+
+    # Command to commit changes
+    _commit_command = "commit"
+
+    # Command to commit changes with a comment
+    _commit_comment_command = "commit comment {}"
+
+    async def _set_base_prompt(self):
+        """
+        Setting two important vars
+            base_prompt - textual prompt in CLI (usually username or hostname)
+            base_pattern - regexp for finding the end of command. (platform-specific)
+
+        For JunOS devices base_pattern is "user(@[hostname])?[>|#]
+        """
+        logger.info("Host %s: Setting base prompt", self._host)
+        prompt = await self._find_prompt()
+        self._last_prompt_terminator = prompt[-1:]
+        prompt = prompt[:-1]
+        # Strip off the user@ part in a single scan, no list allocation
+        _, sep, hostname = prompt.rpartition("@")
+        if sep:
+            prompt = hostname
+        self._base_prompt = prompt
+        # The pattern depends only on class constants, so the compiled
+        # object is memoized on the class and shared by every session
+        cls = type(self)
+        compiled = cls.__dict__.get("_compiled_pattern")
+        if compiled is None:
+            delimiters = cls._get_delimiters_charclass()
+            compiled = re.compile(cls._pattern.format(delimiters=delimiters), re.ASCII)
+            cls._compiled_pattern = compiled
+        self._base_pattern = compiled.pattern
+        self._base_pattern_re = compiled
+        logger.debug("Host %s: Base Prompt: %s", self._host, self._base_prompt)
+        logger.debug("Host %s: Base Pattern: %s", self._host, self._base_pattern)
+        return self._base_prompt
+
+    async def check_config_mode(self):
+        """Checks if in configuration mode.
+
+        Returns boolean"""
+        logger.info("Host %s: Checking configuration mode", self._host)
+        check_string = self._config_check
+        self._stdin.write(self._normalize_cmd("\n"))
+        output = await self._read_until_prompt()
+        # The mode marker only appears in the trailing prompt line
+        return check_string in output.rsplit("\n", 1)[-1]
+
+    async def config_mode(self):
+        """Enters configuration mode
+
+        Optimistically sends the enter command without probing the
+        current mode first; the trailing prompt shows whether it worked
+        and the explicit probe only runs when that echo is inconclusive
+        """
+        logger.info("Host %s: Entering to configuration mode", self._host)
+        self._stdin.write(self._normalize_cmd(self._config_enter))
+        output = await self._read_until_prompt()
+        if self._config_check not in output.rsplit("\n", 1)[-1]:
+            if not await self.check_config_mode():
+                raise ValueError("Failed to enter to configuration mode")
+        return output
+
+    async def exit_config_mode(self):
+        """Exits from configuration mode
+
+        Optimistic like config_mode: the exit command is sent without a
+        pre-check and the trailing prompt is inspected afterwards
+        """
+        logger.info("Host %s: Exiting from configuration mode", self._host)
+        self._stdin.write(self._normalize_cmd(self._config_exit))
+        output = await self._read_until_prompt()
+        if self._config_check in output.rsplit("\n", 1)[-1]:
+            if await self.check_config_mode():
+                raise ValueError("Failed to exit from configuration mode")
+        return output
+
+    async def send_config_set(
+        self,
+        config_commands=None,
+        with_commit=True,
+        commit_comment="",
+        exit_config_mode=True,
+    ):
+        """
+        Sending configuration commands to device
+        By default automatically exits/enters configuration mode.
+
+        :param list config_commands: iterable string list with commands to apply
+        to network devices in system view
+        :param bool with_commit: if true, commits all changes after applying
+        all config_commands
+        :param string commit_comment: message for configuration commit
+        :param bool exit_config_mode: If true, automatically quick configuration mode
+        :return: The output of these commands
+        """
+
+        if config_commands is None:
+            return ""
+
+        # Send config commands
+        parts = [await self.config_mode()]
+        parts.append(await super().send_config_set(config_commands=config_commands))
+        if with_commit:
+            commit = self._commit_command
+            if commit_comment:
+                commit = self._commit_comment_command.format(commit_comment)
+
+            self._stdin.write(self._normalize_cmd(commit))
+            parts.append(await self._read_until_prompt())
+
+        if exit_config_mode:
+            parts.append(await self.exit_config_mode())
+
+        output = self._normalize_linefeeds("".join(parts))
+        logger.debug("Host %s: Config commands output: %r", self._host, output)
+        return output
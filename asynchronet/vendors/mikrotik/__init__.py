@@ -1,3 +1,3 @@
-from .mikrotik_routeros import MikrotikRouterOS
-
-__all__ = ["MikrotikRouterOS"]
+from .mikrotik_routeros import MikrotikRouterOS
+
+__all__ = ["MikrotikRouterOS"]
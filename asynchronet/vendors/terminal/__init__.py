@@ -1,3 +1,3 @@
-from .terminal import Terminal
-
-__all__ = ["Terminal"]
+from .terminal import Terminal
+
+__all__ = ["Terminal"]
@@ -1,36 +1,43 @@
-"""Subclass specific to Ubiquity Edge Switch"""
-import re
-
-from asynchronet.logger import logger
-from asynchronet.vendors.ios_like import IOSLikeDevice
-
-
-class UbiquityEdgeSwitch(IOSLikeDevice):
-    """Class for working with Ubiquity Edge Switches"""
-
-    # Pattern to use when reading buffer. When found, processing ends.
-    _pattern = r"\({prompt}.*?\) (\(.*?\))?[{delimiters}]"
-
-    # Command to enter configuration mode
-    _config_enter = "configure"
-
-    async def _set_base_prompt(self):
-        """
-        Setting two important vars
-            base_prompt - textual prompt in CLI (usually hostname)
-            base_pattern - regexp for finding the end of command. (platform-specific)
-
-        For Ubiquity devices base_pattern is "(prompt) (\(.*?\))?[>|#]"
-        """
-        logger.info(f"Host {self._host}: Setting base prompt")
-        prompt = await self._find_prompt()
-        # Strip off trailing terminator
-        self._base_prompt = prompt[1:-3]
-        delimiters = map(re.escape, type(self)._delimiter_list)
-        delimiters = r"|".join(delimiters)
-        base_prompt = re.escape(self._base_prompt[:12])
-        pattern = type(self)._pattern
-        self._base_pattern = pattern.format(prompt=base_prompt, delimiters=delimiters)
-        logger.debug(f"Host {self._host}: Base Prompt: {self._base_prompt}")
-        logger.debug(f"Host {self._host}: Base Pattern: {self._base_pattern}")
-        return self._base_prompt
+"""Subclass specific to Ubiquity Edge Switch"""
+import re
+
+from asynchronet.logger import logger
+from asynchronet.vendors.ios_like import IOSLikeDevice
+
+
+class UbiquityEdgeSwitch(IOSLikeDevice):
+    """Class for working with Ubiquity Edge Switches"""
+
+    __slots__ = ()
+
+    # Pattern to use when reading buffer. When found, processing ends.
+    # Negated character classes instead of lazy dots keep the match
+    # linear on buffers without a closing prompt
+    _pattern = r"\({prompt}[^)\r\n]*\) (\([^)\r\n]*\))?[{delimiters}]"
+
+    # Command to enter configuration mode
+    _config_enter = "configure"
+
+    async def _set_base_prompt(self):
+        """
+        Setting two important vars
+            base_prompt - textual prompt in CLI (usually hostname)
+            base_pattern - regexp for finding the end of command. (platform-specific)
+
+        For Ubiquity devices base_pattern is "(prompt) (\(.*?\))?[>|#]"
+        """
+        logger.info("Host %s: Setting base prompt", self._host)
+        prompt = await self._find_prompt()
+        self._last_prompt_terminator = prompt[-1:]
+        # Strip off trailing terminator
+        self._base_prompt = prompt[1:-3]
+        cls = type(self)
+        base_prompt = re.escape(self._base_prompt[:12])
+        self._base_pattern = cls._pattern.format(
+            prompt=base_prompt, delimiters=cls._get_delimiters_charclass()
+        )
+        # Compiled once per session; the read loops reuse the object
+        self._base_pattern_re = re.compile(self._base_pattern, re.ASCII)
+        logger.debug("Host %s: Base Prompt: %s", self._host, self._base_prompt)
+        logger.debug("Host %s: Base Pattern: %s", self._host, self._base_pattern)
+        return self._base_prompt
@@ -1,8 +1,8 @@
-"""
-Asynchronet Version information
-"""
-
-__version__ = "0.1.0"
-__author__ = "Hunter Johnston"
-__author_email__ = "hunter@huntabyte.com"
-__url__ = "http://asynchronet.readthedocs.io/"
+"""
+Asynchronet Version information
+"""
+
+__version__ = "0.1.0"
+__author__ = "Hunter Johnston"
+__author_email__ = "hunter@huntabyte.com"
+__url__ = "http://asynchronet.readthedocs.io/"
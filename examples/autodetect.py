@@ -24,15 +24,25 @@ devices = [
 ]
 
 
-async def guess(device):
-    guesser = SSHDetect(**device)
-    best_match = await guesser.autodetect()
-    print(best_match)
-    return best_match
+# Cap concurrent SSH handshakes when probing a large device list
+MAX_CONCURRENT = 32
+
+
+async def guess(device, semaphore):
+    async with semaphore:
+        guesser = SSHDetect(**device)
+        best_match = await guesser.autodetect()
+        print(best_match)
+        return best_match
 
 
 async def main():
-    results = await asyncio.gather(*[guess(device) for device in devices])
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT)
+    # TaskGroup (3.11+) cancels the remaining probes as soon as one
+    # fails, so a single bad device cannot hang the whole batch
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(guess(device, semaphore)) for device in devices]
+    results = [task.result() for task in tasks]
     print(results)
 
 